@@ -0,0 +1,271 @@
+"""
+Замеры производительности модели (model).
+
+Запуск из каталога src:
+    python benchmark.py [--scale quick|full] [--only NAME ...] [--output FILE]
+
+Результат - JSON: сведения о запуске, по записи на каждый замер
+(имя, масштаб, число операций, секунды, операций в секунду) и расход памяти
+на питомца и на запись истории - для сравнения между версиями.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import sys
+import tracemalloc
+from datetime import datetime, timezone
+from time import perf_counter
+
+from model.collection import cube
+from model.events import EventLog
+from model.history import History, State
+from model.kind import Creature
+from model.parameters import Health, Parameters, Satiety
+from model.population import Population
+
+
+# масштабы: число питомцев и число тактов
+SCALES = {
+    'quick': {
+        'pets': (1, 100, 1_000),
+        'ticks': (10, 1_000, 100_000),
+    },
+    'full': {
+        'pets': (1, 100, 10_000, 100_000),
+        'ticks': (10, 10_000, 1_000_000, 10_000_000),
+    },
+}
+
+
+def bench_creature_init(count: int) -> float:
+    """Создание count питомцев."""
+    start = perf_counter()
+    for i in range(count):
+        Creature(cube, str(i))
+    return perf_counter() - start
+
+
+def bench_population_tick(count: int) -> float:
+    """Один такт популяции из count питомцев."""
+    population = Population(cube, count)
+    start = perf_counter()
+    population.tick()
+    return perf_counter() - start
+
+
+def bench_creature_update(count: int) -> float:
+    """count вызовов Creature.update() одного питомца."""
+    creature = Creature(cube, 'bench')
+    update = creature.update
+    start = perf_counter()
+    for _ in range(count):
+        update()
+    return perf_counter() - start
+
+
+def bench_creature_advance(count: int) -> float:
+    """Creature.advance() на count тактов."""
+    creature = Creature(cube, 'bench')
+    start = perf_counter()
+    creature.advance(count)
+    return perf_counter() - start
+
+
+def bench_random_action(count: int) -> float:
+    """count вызовов Creature.random_action()."""
+    creature = Creature(cube, 'bench')
+    action = creature.random_action
+    # активности питомцев печатают сообщения
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        start = perf_counter()
+        for _ in range(count):
+            action()
+            if output.tell() > 1 << 20:
+                output.seek(0)
+                output.truncate()
+        return perf_counter() - start
+
+
+def bench_age_setter(count: int) -> float:
+    """count присваиваний Creature.age с переходом через границы периодов."""
+    creature = Creature(cube, 'bench')
+    ages = [left for left, _ in cube] * 2
+    ages = (ages * (count // len(ages) + 1))[:count]
+    start = perf_counter()
+    for age in ages:
+        creature.age = age
+    return perf_counter() - start
+
+
+def bench_history_get_param(count: int) -> float:
+    """count вызовов History.get_param() по заполненной истории."""
+    history = History()
+    state = State(0)
+    for member in Parameters:
+        state[member.value] = 1.0
+    for _ in range(history.ages.capacity):
+        history.append(state)
+    get_param = history.get_param
+    start = perf_counter()
+    for _ in range(count):
+        get_param(Satiety)
+    return perf_counter() - start
+
+
+def bench_history_query(count: int) -> float:
+    """count запросов History.query() по двум параметрам за 30 ИД истории."""
+    history = History(retention=30 * 24, thresholds={Health: 10.0})
+    state = State(0)
+    for tick in range(30 * history.ages.capacity):
+        state.age = tick // history.ages.capacity
+        for member in Parameters:
+            state[member.value] = float(tick % 50)
+        history.append(state)
+    query = history.query
+    start = perf_counter()
+    for _ in range(count):
+        query(Health, Satiety, ages=(5, 25))
+    return perf_counter() - start
+
+
+def bench_kind_lookup(count: int) -> float:
+    """count обращений Kind[возраст] к случайным возрастам."""
+    _, last = max(cube)
+    rand = random.Random(0)
+    ages = [rand.randint(0, last) for _ in range(min(count, 100_000))]
+    ages = (ages * (count // len(ages) + 1))[:count]
+    start = perf_counter()
+    for age in ages:
+        cube[age]
+    return perf_counter() - start
+
+
+def bench_event_replay(count: int) -> tuple[float, int]:
+    """Повтор всего журнала событий из count тактов - от первого снимка.
+
+    Возвращает время и число повторённых событий.
+    """
+    creature = Creature(cube, 'bench')
+    # один снимок - повтор журнала целиком
+    journal = EventLog.attach(creature, interval=count * 4 + 1)
+    feed = next(a for a in creature.player_actions if a.name == 'Покормить')
+    with contextlib.redirect_stdout(io.StringIO()):
+        for tick in range(count):
+            creature.update()
+            creature.random_action()
+            # кормление раз в ИЧ
+            if tick % 60 == 0:
+                feed.do()
+    start = perf_counter()
+    journal.rebuild()
+    return perf_counter() - start, len(journal)
+
+
+BENCHMARKS = {
+    'creature_init': (bench_creature_init, 'pets'),
+    'population_tick': (bench_population_tick, 'pets'),
+    'creature_update': (bench_creature_update, 'ticks'),
+    'creature_advance': (bench_creature_advance, 'ticks'),
+    'random_action': (bench_random_action, 'ticks'),
+    'age_setter': (bench_age_setter, 'ticks'),
+    'history_get_param': (bench_history_get_param, 'ticks'),
+    'history_query': (bench_history_query, 'ticks'),
+    'kind_lookup': (bench_kind_lookup, 'ticks'),
+    'event_replay': (bench_event_replay, 'ticks'),
+}
+
+
+def _allocated(build, count: int) -> float:
+    """Байт памяти на объект, созданный build() (объекты удерживаются)."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [build() for _ in range(count)]
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del objects
+    return allocated / count
+
+
+def measure_memory() -> dict[str, float]:
+    """Память на питомца, на State и на такт заполненной History, байт."""
+    creature = Creature(cube, 'bench')
+    state = creature.save()
+    history = History()
+    capacity = history.ages.capacity
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for _ in range(capacity):
+        history.append(state)
+    history_entry = (tracemalloc.get_traced_memory()[0] - before) / capacity
+    tracemalloc.stop()
+    return {
+        'creature_bytes': _allocated(lambda: Creature(cube, 'bench'), 1_000),
+        'state_bytes': _allocated(creature.save, 10_000),
+        'history_entry_bytes': history_entry,
+    }
+
+
+def _timed(result: float | tuple[float, int], size: int) -> tuple[float, int]:
+    if isinstance(result, tuple):
+        return result
+    return result, size
+
+
+def run(scale: str, names: list[str], repeat: int) -> dict:
+    """Выполнение замеров; лучшее время из repeat повторов."""
+    results = []
+    for name in names:
+        function, unit = BENCHMARKS[name]
+        for size in SCALES[scale][unit]:
+            # замер возвращает время или (время, число операций)
+            seconds, operations = min(
+                _timed(function(size), size) for _ in range(repeat)
+            )
+            results.append({
+                'benchmark': name,
+                'unit': unit,
+                'size': size,
+                'operations': operations,
+                'seconds': seconds,
+                'per_second': operations / seconds if seconds else None,
+            })
+            print(
+                f'{name:>20} {size:>12,} {unit:<5} {seconds:10.4f} s'
+                f' {operations / seconds if seconds else 0:14,.0f} /s',
+                file=sys.stderr
+            )
+    memory = measure_memory()
+    for name, size in memory.items():
+        print(f'{name:>20} {size:12,.0f} B', file=sys.stderr)
+    return {
+        'started': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'scale': scale,
+        'repeat': repeat,
+        'results': results,
+        'memory': memory,
+    }
+
+
+def main(argv: list[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scale', choices=SCALES, default='quick')
+    parser.add_argument('--only', nargs='+', choices=BENCHMARKS, default=list(BENCHMARKS))
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--output', help='файл для JSON (по умолчанию - stdout)')
+    args = parser.parse_args(argv)
+    report = json.dumps(run(args.scale, args.only, args.repeat), indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(report + os.linesep)
+    else:
+        print(report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+"""
+Игровые часы (ТЗ 6б): обновление питомцев в реальном времени.
+
+Часы работают в собственном потоке с циклом событий asyncio
+и не блокируют поток графического интерфейса.
+"""
+__all__ = [
+    'GameClock',
+]
+
+import asyncio
+import threading
+from collections import deque
+from statistics import fmean
+from typing import Callable
+
+from model.gametime import TICKS_PER_DAY
+from model.kind import Creature
+
+
+class GameClock:
+    """Игровые часы: такты обновления всех загруженных питомцев.
+
+    Сроки тактов отсчитываются от момента запуска, поэтому ошибки
+    ожидания не накапливаются. Такты, пропущенные из-за задержки
+    цикла событий, выполняются одним шагом через Creature.advance().
+    """
+
+    def __init__(self, minutes_per_day: float, ticks_per_day: int = TICKS_PER_DAY):
+        self.ticks_per_day = ticks_per_day
+        # секунд реального времени на такт
+        self.period: float = minutes_per_day * 60 / ticks_per_day
+        self.creatures: list[Creature] = []
+        # питомцы, вышедшие за последний возрастной период
+        self.expired: list[Creature] = []
+        # вызываются в потоке часов после каждого шага: f(номер такта)
+        self.listeners: list[Callable[[int], None]] = []
+        self.ticks = 0
+        self.steps = 0
+        self.coalesced = 0
+        # опоздание тактов относительно расписания, с
+        self.latencies: deque[float] = deque(maxlen=1000)
+        self.__loop: asyncio.AbstractEventLoop = None
+        self.__task: asyncio.Task = None
+        self.__thread: threading.Thread = None
+
+    def add(self, creature: Creature) -> None:
+        self.creatures.append(creature)
+
+    def remove(self, creature: Creature) -> None:
+        self.creatures.remove(creature)
+
+    async def run(self) -> None:
+        """Цикл тактов до отмены задачи."""
+        loop = asyncio.get_running_loop()
+        start = loop.time() - self.ticks * self.period
+        while True:
+            deadline = start + (self.ticks + 1) * self.period
+            await asyncio.sleep(max(0.0, deadline - loop.time()))
+            now = loop.time()
+            self.latencies.append(now - deadline)
+            due = int((now - start) / self.period) - self.ticks
+            self.step(max(1, due))
+
+    def step(self, ticks: int = 1) -> None:
+        """Обновление всех питомцев на ticks тактов.
+
+        Для каждого питомца - Creature._advance() на пропущенные такты,
+        один Creature.update() с сохранением состояния и случайные действия
+        питомца на каждый такт; подписчики получают одно изменение за шаг.
+        """
+        self.steps += 1
+        self.coalesced += ticks - 1
+        while ticks:
+            chunk = min(ticks, self.ticks_per_day - self.ticks % self.ticks_per_day)
+            ticks -= chunk
+            self.ticks += chunk
+            new_day = self.ticks % self.ticks_per_day == 0
+            for creature in tuple(self.creatures):
+                if chunk > 1:
+                    creature._advance(chunk - 1)
+                creature.update()
+                creature.random_actions(chunk)
+                if new_day:
+                    try:
+                        creature.age += 1
+                    except KeyError:
+                        self.creatures.remove(creature)
+                        self.expired.append(creature)
+        for listener in self.listeners:
+            listener(self.ticks)
+
+    def stats(self) -> dict[str, float]:
+        """Статистика опозданий тактов, с."""
+        latencies = sorted(self.latencies)
+        if not latencies:
+            return {'ticks': self.ticks, 'steps': self.steps, 'coalesced': self.coalesced}
+        return {
+            'ticks': self.ticks,
+            'steps': self.steps,
+            'coalesced': self.coalesced,
+            'latency_mean': fmean(latencies),
+            'latency_p95': latencies[int(0.95 * (len(latencies) - 1))],
+            'latency_max': latencies[-1],
+        }
+
+    def start(self) -> threading.Thread:
+        """Запуск часов в фоновом потоке."""
+        if self.__thread is not None:
+            raise RuntimeError('Clock is already running.')
+        started = threading.Event()
+
+        def target() -> None:
+            self.__loop = asyncio.new_event_loop()
+            self.__task = self.__loop.create_task(self.run())
+            started.set()
+            try:
+                self.__loop.run_until_complete(self.__task)
+            except asyncio.CancelledError:
+                pass
+            finally:
+                self.__loop.close()
+
+        self.__thread = threading.Thread(target=target, name='GameClock', daemon=True)
+        self.__thread.start()
+        started.wait()
+        return self.__thread
+
+    def stop(self) -> None:
+        """Остановка часов (из любого потока)."""
+        if self.__thread is None:
+            return
+        self.__loop.call_soon_threadsafe(self.__task.cancel)
+        self.__thread.join()
+        self.__thread = None
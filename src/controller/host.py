@@ -0,0 +1,239 @@
+"""
+Многопроцессный хост симуляции для большого числа питомцев.
+
+Питомцы делятся на шарды; каждый шард постоянно живёт в своём
+процессе-обработчике, а координатору возвращаются только изменения.
+"""
+__all__ = [
+    'SimulationHost',
+]
+
+import hashlib
+import os
+from array import array
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Callable, Iterable, Mapping
+
+from model.kind import Kind, Creature
+from model.persistence import dump, load
+from model.rng import RandomStream
+
+
+# изменения питомца за шаг: (ключ, [(индекс параметра, значение)], [активности])
+Delta = tuple[str, list[tuple[int, float]], list[str]]
+
+# состояние шарда в процессе-обработчике
+_creatures: dict[str, Creature] = {}
+_paths: dict[str, Path] = {}
+
+
+def _load_shard(
+        paths: dict[str, Path],
+        kinds: Mapping[str, Kind],
+        seed: int,
+        generation: int
+) -> None:
+    """Загрузка шарда из снимков (инициализатор процесса)."""
+    _paths.update(paths)
+    for key, path in paths.items():
+        _creatures[key] = load(path, kinds, RandomStream(seed, key, generation))
+
+
+def _changed(before: array, creature: Creature) -> list[tuple[int, float]]:
+    return [
+        (i, value)
+        for i, (old, value) in enumerate(zip(before, creature.storage.data))
+        if old != value
+    ]
+
+
+def _tick_shard(ticks: int) -> list[Delta]:
+    """Шаг шарда на ticks тактов."""
+    deltas = []
+    for key, creature in _creatures.items():
+        before = array('d', creature.storage.data)
+        if ticks > 1:
+            creature._advance(ticks - 1)
+        creature.update()
+        actions = [
+            action.__class__.__name__ for action in creature.random_actions(ticks)
+        ]
+        changed = _changed(before, creature)
+        if changed or actions:
+            deltas.append((key, changed, actions))
+    return deltas
+
+
+def _grow_shard(days: int) -> tuple[list[Delta], list[str]]:
+    """Увеличение возраста питомцев шарда.
+
+    Питомцы, вышедшие за последний возрастной период, убираются из шарда
+    (как в GameClock); возвращаются изменения и ключи таких питомцев.
+    """
+    deltas, expired = [], []
+    for key, creature in tuple(_creatures.items()):
+        before = array('d', creature.storage.data)
+        try:
+            creature.age += days
+        except KeyError:
+            del _creatures[key]
+            expired.append(key)
+            continue
+        changed = _changed(before, creature)
+        if changed:
+            deltas.append((key, changed, []))
+    return deltas, expired
+
+
+def _checkpoint_shard(seed: int, generation: int) -> int:
+    """Сохранение снимков шарда.
+
+    Потоки случайных чисел начинаются заново для номера снимка generation -
+    так же, как после перезапуска процесса со снимков.
+    """
+    for key, creature in _creatures.items():
+        dump(creature, _paths[key])
+        creature.rng = RandomStream(seed, key, generation)
+    return len(_creatures)
+
+
+class SimulationHost:
+    """Хост симуляции: питомцы распределены по шардам-процессам.
+
+    Питомцы задаются файлами снимков (model.persistence). Координатор
+    хранит копию значений параметров, обновляемую по изменениям шардов.
+    Упавший процесс пересоздаётся, загружает шард из последних снимков
+    и повторяет шаги, выполненные после них, - все шарды остаются
+    в одном времени симуляции.
+
+    Поток случайных чисел питомца выводится из seed, ключа питомца
+    и номера снимка, поэтому результат не зависит от числа шардов
+    и перезапусков процессов.
+    """
+
+    def __init__(
+            self,
+            paths: Iterable[str | os.PathLike],
+            kinds: Mapping[str, Kind],
+            shards: int = os.cpu_count() or 1,
+            seed: int = None
+    ):
+        self.kinds = kinds
+        if seed is None:
+            seed = int.from_bytes(os.urandom(16), 'little')
+        self.seed = seed
+        # число сохранённых снимков - номер потоков случайных чисел
+        self.generation = 0
+        self.shards: list[dict[str, Path]] = [{} for _ in range(shards)]
+        for path in map(Path, paths):
+            key = str(path)
+            digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+            self.shards[int.from_bytes(digest, 'little') % shards][key] = path
+        self.values: dict[str, array] = {}
+        # питомцы, вышедшие за последний возрастной период, - не загружаются
+        self.expired: set[str] = set()
+        self.restarts = 0
+        # шаги (tick, grow) после последнего снимка - для повтора в упавшем шарде
+        self.__log: list[tuple[Callable, tuple]] = []
+        self.__executors = [self.__spawn(shard) for shard in self.shards]
+        for key, path in self.__paths():
+            self.values[key] = load(path, kinds).storage.data
+
+    def __paths(self) -> Iterable[tuple[str, Path]]:
+        for shard in self.shards:
+            yield from shard.items()
+
+    def __spawn(self, shard: dict[str, Path]) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=1,
+            initializer=_load_shard,
+            initargs=(
+                {key: path for key, path in shard.items() if key not in self.expired},
+                self.kinds, self.seed, self.generation
+            )
+        )
+
+    def __restart(self, i: int) -> None:
+        """Пересоздание процесса шарда i - загрузка из последних снимков
+        и повтор шагов после них."""
+        self.restarts += 1
+        self.__executors[i].shutdown(wait=False, cancel_futures=True)
+        self.__executors[i] = executor = self.__spawn(self.shards[i])
+        try:
+            for function, args in self.__log:
+                executor.submit(function, *args).result()
+        except BrokenProcessPool as error:
+            raise RuntimeError(
+                f'Shard {i} crashed again while replaying {len(self.__log)} steps.'
+            ) from error
+
+    def __submit(self, i: int, function, *args) -> Future:
+        try:
+            return self.__executors[i].submit(function, *args)
+        except BrokenProcessPool:
+            self.__restart(i)
+            return self.__executors[i].submit(function, *args)
+
+    def __call(self, function, *args) -> list:
+        """Вызов function во всех шардах параллельно, с перезапуском упавших."""
+        futures = [
+            self.__submit(i, function, *args) for i in range(len(self.shards))
+        ]
+        results = []
+        for i, future in enumerate(futures):
+            try:
+                results.append(future.result())
+            except BrokenProcessPool:
+                self.__restart(i)
+                if function is _checkpoint_shard:
+                    # часть снимков шарда могла быть уже перезаписана
+                    raise RuntimeError(f'Shard {i} crashed during checkpoint.')
+                results.append(self.__submit(i, function, *args).result())
+        return results
+
+    def __step(self, function, *args) -> list:
+        """Шаг всех шардов с записью в журнал шагов после снимка."""
+        results = self.__call(function, *args)
+        self.__log.append((function, args))
+        return results
+
+    def __apply(self, results: list[list[Delta]]) -> list[Delta]:
+        deltas = [delta for result in results for delta in result]
+        for key, changed, _ in deltas:
+            values = self.values[key]
+            for index, value in changed:
+                values[index] = value
+        return deltas
+
+    def tick(self, ticks: int = 1) -> list[Delta]:
+        """Шаг всех шардов на ticks тактов; возвращает изменения."""
+        return self.__apply(self.__step(_tick_shard, ticks))
+
+    def grow(self, days: int = 1) -> list[Delta]:
+        """Увеличение возраста всех питомцев на days ИД.
+
+        Питомцы, вышедшие за последний возрастной период, переходят в expired.
+        """
+        results = self.__step(_grow_shard, days)
+        for _, expired in results:
+            self.expired.update(expired)
+        return self.__apply([deltas for deltas, _ in results])
+
+    def checkpoint(self) -> int:
+        """Сохранение снимков всех шардов; возвращает число питомцев."""
+        saved = sum(self.__call(_checkpoint_shard, self.seed, self.generation + 1))
+        self.generation += 1
+        self.__log.clear()
+        return saved
+
+    def close(self) -> None:
+        for executor in self.__executors:
+            executor.shutdown()
+
+    def __enter__(self) -> 'SimulationHost':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -2,13 +2,22 @@
 Controller (MVC).
 """
 from pathlib import Path
+from types import ModuleType
 import sys
 
 sys.path.append(f'{Path(sys.path[0]).parent}')
 
 from model.collection import Kinds
-from view.tk_gui import *
 
 
+def view() -> ModuleType:
+    """Графический интерфейс - Tkinter импортируется при первом обращении."""
+    from view import tk_gui
+    return tk_gui
 
 
+def start() -> None:
+    """Запуск приложения: главное меню выбора вида питомца (ТЗ 1а)."""
+    main_menu = getattr(view(), 'main_menu', None)
+    if main_menu is not None:
+        main_menu(Kinds)
@@ -1,5 +1,69 @@
 """
 Главный управляющий модуль. Точка входа.
+
+    python main.py                  - запуск приложения
+    python main.py --import-report  - время импорта по подсистемам
 """
-import controller.kinds as controller
+import argparse
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+
+# бюджет времени импорта до главного меню, с
+STARTUP_BUDGET = 0.25
+SUBSYSTEMS = ('model', 'view', 'controller', 'tkinter')
+
+
+def import_report(budget: float = STARTUP_BUDGET) -> int:
+    """Отчёт -X importtime по подсистемам для пути запуска до главного меню.
+    
+    Возвращает 1, если суммарное время импорта превышает бюджет.
+    """
+    code = 'import controller.kinds as controller; controller.view()'
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=Path(__file__).parent,
+        capture_output=True,
+        text=True
+    )
+    totals: dict[str, float] = defaultdict(float)
+    counts: dict[str, int] = defaultdict(int)
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line.removeprefix('import time:').split('|')
+        package = name.strip().split('.')[0]
+        subsystem = package if package in SUBSYSTEMS else 'other'
+        totals[subsystem] += int(self_us) / 1e6
+        counts[subsystem] += 1
+    if result.returncode:
+        print(result.stderr, file=sys.stderr)
+        return result.returncode
+    total = sum(totals.values())
+    for subsystem, seconds in sorted(totals.items(), key=lambda item: -item[1]):
+        print(f'{subsystem:<12}{counts[subsystem]:>5} modules {seconds * 1000:9.1f} ms')
+    print(f'{"total":<12}{sum(counts.values()):>5} modules {total * 1000:9.1f} ms'
+          f' (budget {budget * 1000:.0f} ms)')
+    return int(total > budget)
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Тамагочи')
+    parser.add_argument(
+        '--import-report', 
+        action='store_true',
+        help='время импорта по подсистемам вместо запуска'
+    )
+    parser.add_argument('--budget', type=float, default=STARTUP_BUDGET)
+    args = parser.parse_args(argv)
+    if args.import_report:
+        return import_report(args.budget)
+    import controller.kinds as controller
+    controller.start()
+    return 0
+
 
+if __name__ == '__main__':
+    sys.exit(main())
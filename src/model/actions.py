@@ -1,4 +1,7 @@
 __all__ = [
+    'BoundAction',
+    'apply_action',
+    'apply_actions',
     'Feed', 
     'TeaseHead', 
     'ChaseTail', 
@@ -7,80 +10,184 @@ __all__ = [
 
 from pathlib import Path
 from abc import ABC, abstractmethod
+from typing import Iterable, Type
 from .parameters import Parameters, Creature
 
 
 class Action(ABC):
-    """Выполнение действия."""
+    """Выполнение действия.
+    
+    Экземпляры - прототипы, общие для всех питомцев возрастного периода, 
+    и не изменяются после создания. Питомец получает BoundAction.
+    """
+    __slots__ = ()
     name: str
 
-    def __init__(self, creature: 'Creature' = None):
-        self.creature = creature
-
     def __hash__(self):
         return hash(self.name)
 
     @abstractmethod
-    def do(self) -> None:
+    def do(self, creature: Creature) -> None:
         pass
 
+    def effects(self, amount: float = None) -> dict[Type, float] | None:
+        """Приращения параметров питомца: класс параметра -> изменение.
+        
+        amount заменяет величину действия (например, Feed.amount). 
+        None - действие выполняется только через do().
+        """
+        return None
+
+
+class BoundAction:
+    """Действие, привязанное к питомцу: общий прототип + ссылка на питомца."""
+    __slots__ = ('prototype', 'creature')
+
+    def __init__(self, prototype: Action, creature: Creature):
+        self.prototype = prototype
+        self.creature = creature
+
+    def __getattr__(self, name: str):
+        return getattr(object.__getattribute__(self, 'prototype'), name)
+
+    def do(self, amount: float = None) -> None:
+        apply_action(self.creature, self.prototype, amount)
+
 
 class PlayerAction(Action):
     """Выполнение действия игроком."""
+    __slots__ = ()
     image: Path
 
 
 class Feed(PlayerAction):
     """Выполнение действия игроком - покормить питомца."""
+    __slots__ = ('amount',)
     name: str = 'Покормить'
     image: Path = Path() # 'path/image/feed'
 
-    def __init__(
-            self,
-            amount: float,
-            creature: Creature = None
-    ):
+    def __init__(self, amount: float):
         self.amount = amount
-        super().__init__(creature)
 
-    def do(self) -> None:
+    def do(self, creature: Creature) -> None:
         """Выполненить действие - покормить."""
-        self.creature.parameters[Parameters.Satiety].value += self.amount
+        creature.parameters[Parameters.Satiety.value].value += self.amount
+
+    def effects(self, amount: float = None) -> dict[Type, float]:
+        return {Parameters.Satiety.value: self.amount if amount is None else amount}
 
 
 class TeaseHead(PlayerAction):
     """Выполнение действия игроком - почесать голову питомцу."""
+    __slots__ = ()
     name: str = 'Почесать голову'
     image: Path = Path() # 'path/image/feed'
 
-    def do(self) -> None:
+    def do(self, creature: Creature) -> None:
         """Выполненить действие - почесать голову питомцу."""
         ...
 
+    def effects(self, amount: float = None) -> dict[Type, float]:
+        return {}
+
 
 class CreatureAction(Action):
     """Выполнение действия питомцем."""
+    __slots__ = ('rand_coeff',)
 
-    def __init__(
-            self, 
-            rand_coeff: float,
-            creature: 'Creature' = None,
-    ):
+    def __init__(self, rand_coeff: float):
         self.rand_coeff = rand_coeff
-        super().__init__(creature)
 
 class NoAction(Action):
     """Бездействие - заглушка."""
+    __slots__ = ()
     name = 'No Action'
 
-    def do(self) -> None:
+    def do(self, creature: Creature = None) -> None:
         """Бездействует."""
         print(f'{self.name}')
 
 class ChaseTail(CreatureAction):
     """Выполнение действия питомцем - погоня за хвостом."""
+    __slots__ = ()
     name: str =  'погоня за хвостом'
 
-    def do(self):
+    def do(self, creature: Creature) -> None:
         """Выполненить действие - погоня за хвостом."""
         print(f'Event - {self.__doc__}')
+
+    def effects(self, amount: float = None) -> dict[Type, float]:
+        return {}
+
+
+def apply_action(creature: Creature, action: Action, amount: float = None) -> None:
+    """Выполнение действия над питомцем; amount - величина действия.
+
+    Действие записывается в журнал событий питомца, если он подключён.
+    """
+    # BoundAction питомца - по его прототипу
+    action = getattr(action, 'prototype', action)
+    _apply(creature, action, amount)
+    if creature.journal is not None:
+        creature.journal.action(action, amount)
+
+
+def _apply(creature: Creature, action: Action, amount: float = None) -> None:
+    """apply_action() без записи в журнал."""
+    if amount is None:
+        action.do(creature)
+        return
+    effects = action.effects(amount)
+    if effects is None:
+        raise ValueError(f'{action.name}: amount is not supported.')
+    for cls, delta in effects.items():
+        creature.parameters[cls].value += delta
+
+
+def apply_actions(batch: Iterable[tuple[Creature, Action, float | None]]) -> None:
+    """Выполнение множества действий игрока за один проход.
+    
+    Приращения группируются по питомцу и параметру, и к диапазону 
+    значение приводится один раз. Результат совпадает с поочерёдным 
+    apply_action(): если приращения параметра разных знаков или значение 
+    вне диапазона, они применяются по одному. Действия без effects() 
+    выполняются по одному вместе со всеми действиями того же питомца.
+    """
+    # величина действия не меняется в пакете - приращения считаются один раз
+    effects: dict[tuple[Action, float | None], dict[Type, float] | None] = {}
+    # питомец -> [действия по порядку, приращения по параметрам или None]
+    groups: dict[Creature, list] = {}
+    for creature, action, amount in batch:
+        key = getattr(action, 'prototype', action), amount
+        try:
+            effect = effects[key]
+        except KeyError:
+            effect = effects[key] = key[0].effects(amount)
+        group = groups.get(creature)
+        if group is None:
+            group = groups[creature] = [[], {}]
+        group[0].append(key)
+        if effect is None:
+            group[1] = None
+        elif group[1] is not None:
+            for cls, delta in effect.items():
+                group[1].setdefault(cls, []).append(delta)
+    for creature, (items, deltas) in groups.items():
+        if deltas is None:
+            for action, amount in items:
+                _apply(creature, action, amount)
+        else:
+            for cls, changes in deltas.items():
+                parameter = creature.parameters[cls]
+                value, (low, high) = parameter.value, parameter.range
+                if low <= value <= high and (min(changes) >= 0 or max(changes) <= 0):
+                    # при одном знаке промежуточное приведение не влияет на итог;
+                    # сложение по порядку - как при поочерёдном применении
+                    for delta in changes:
+                        value += delta
+                    parameter.value = value
+                else:
+                    for delta in changes:
+                        parameter.value += delta
+        if creature.journal is not None:
+            creature.journal.actions(items)
@@ -0,0 +1,162 @@
+"""
+Каталог видов питомцев (ТЗ 1а) из файлов данных TOML.
+
+Файл вида компилируется в объекты Kind/MaturePhase при первом 
+обращении по имени; результат кэшируется на диске по хэшу файла
+и хэшу исходного кода модели (раскладки кэшированных объектов).
+"""
+__all__ = [
+    'KindCatalog', 'compile_kind',
+]
+
+import hashlib
+import json
+import os
+import pickle
+from pathlib import Path
+from typing import Iterator, Mapping
+from . import actions
+from .kind import Kind, MaturePhase
+from .parameters import Parameters
+
+
+# версия формата кэша; раскладка объектов учитывается хэшем исходников модели
+CACHE_VERSION = 4
+
+# ошибки чтения устаревшего или повреждённого кэша - вид компилируется заново
+_STALE = (
+    OSError, EOFError, pickle.UnpicklingError, 
+    AttributeError, ImportError, TypeError, ValueError, IndexError, KeyError
+)
+
+_model_digest: str = None
+
+
+def model_digest() -> str:
+    """Хэш исходного кода модулей model - часть ключа кэша."""
+    global _model_digest
+    if _model_digest is None:
+        digest = hashlib.sha256(str(CACHE_VERSION).encode())
+        for path in sorted(Path(__file__).parent.glob('*.py')):
+            digest.update(path.name.encode() + b'\0' + path.read_bytes())
+        _model_digest = digest.hexdigest()[:16]
+    return _model_digest
+
+
+def compile_kind(data: dict) -> Kind:
+    """Вид питомца из описания (содержимого файла TOML)."""
+    phases = []
+    for phase in data['phases']:
+        parameters = [
+            Parameters[name].value(*values)
+            for name, values in phase['parameters'].items()
+        ]
+        player_actions, creature_actions = (
+            [
+                getattr(actions, spec['action'])(
+                    **{key: value for key, value in spec.items() if key != 'action'}
+                )
+                for spec in phase.get(group, ())
+            ]
+            for group in ('player_actions', 'creature_actions')
+        )
+        phases.append(MaturePhase(
+            phase['days'],
+            *parameters,
+            player_actions=player_actions,
+            creature_actions=creature_actions
+        ))
+    return Kind(data['name'], *phases)
+
+
+class KindCatalog(Mapping[str, Kind]):
+    """Виды питомцев из каталога файлов *.toml.
+
+    Ключ - имя файла без расширения или Kind.name. Вид загружается 
+    при первом обращении: из кэша, если файл не менялся, иначе 
+    компилируется и кэшируется.
+    """
+
+    def __init__(self, directory: str | os.PathLike, cache: str | os.PathLike = None):
+        self.directory = Path(directory)
+        self.cache = Path(cache) if cache else self.directory / '__pycache__'
+        self.files: dict[str, Path] = {
+            path.stem: path for path in sorted(self.directory.glob('*.toml'))
+        }
+        self.__kinds: dict[str, Kind] = {}
+        self.__index: dict[str, str] = None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.files)
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.files or self.__find(key) is not None
+
+    def __getitem__(self, key: str) -> Kind:
+        kind = self.__kinds.get(key)
+        if kind is not None:
+            return kind
+        stem = key if key in self.files else self.__find(key)
+        if stem is None:
+            raise KeyError(key)
+        kind = self.__kinds.get(stem) or self.__load(stem)
+        self.__kinds[stem] = self.__kinds[kind.name] = kind
+        return kind
+
+    @property
+    def index(self) -> dict[str, str]:
+        """Кэшированные имена видов: хэш файла -> Kind.name."""
+        if self.__index is None:
+            try:
+                self.__index = json.loads((self.cache / 'kinds.json').read_text('utf-8'))
+            except (OSError, ValueError):
+                self.__index = {}
+        return self.__index
+
+    def __find(self, name: str) -> str | None:
+        """Имя файла вида по Kind.name - без компиляции, если он в кэше."""
+        for stem, path in self.files.items():
+            cached = self.index.get(self.__digest(path))
+            if cached is None:
+                cached = self[stem].name
+            if cached == name:
+                return stem
+        return None
+
+    @staticmethod
+    def __digest(path: Path) -> str:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+
+    def __load(self, stem: str) -> Kind:
+        source = self.files[stem].read_bytes()
+        digest = hashlib.sha256(source).hexdigest()
+        cached = self.cache / f'{stem}.{digest[:16]}.{model_digest()}.pickle'
+        try:
+            with open(cached, 'rb') as file:
+                kind = pickle.load(file)
+            if isinstance(kind, Kind):
+                return kind
+        except _STALE:
+            pass
+        # разбор TOML нужен только при изменении файла
+        import tomllib
+        kind = compile_kind(tomllib.loads(source.decode('utf-8')))
+        try:
+            self.cache.mkdir(parents=True, exist_ok=True)
+            for stale in self.cache.glob(f'{stem}.*.pickle'):
+                stale.unlink()
+            temp = cached.with_suffix('.tmp')
+            with open(temp, 'wb') as file:
+                pickle.dump(kind, file, pickle.HIGHEST_PROTOCOL)
+            os.replace(temp, cached)
+            self.index[digest] = kind.name
+            (self.cache / 'kinds.json').write_text(
+                json.dumps(self.index, ensure_ascii=False), 'utf-8'
+            )
+        except OSError:
+            # каталог только для чтения - работаем без кэша
+            pass
+        return kind
@@ -1,55 +1,17 @@
-Kinds = [
-    'cube',
-]
-
-
+from pathlib import Path
 from .parameters import *
 from .actions import *  
 from .kind import *
+from .catalog import KindCatalog
+
+
+# виды питомцев загружаются при первом обращении, например collection.cube
+catalog = KindCatalog(Path(__file__).parent / 'kinds')
+
+Kinds = list(catalog)
+
 
-cube = Kind(
-    'Кубик', 
-    MaturePhase(
-        5, 
-        Parameters(Health).value(50, 0, 50),
-        Parameters(Satiety).value(50, 0, 50),
-        Parameters(Fatigue).value(50, 0, 50),
-        Parameters(Hygiene).value(50, 0, 50),
-        Parameters(Mood).value(50, 0, 50),
-        Parameters(Stamina).value(50, 0, 50),
-        player_actions=[
-            Feed(3)
-        ],
-        creature_actions=[
-            ChaseTail(0.7),
-        ]
-    ),
-    MaturePhase(
-        20,
-        Parameters(Health).value(0, 0, 75),
-        Parameters(Satiety).value(0, 0, 75),
-        Parameters(Fatigue).value(0, 0, 75),
-        Parameters(Hygiene).value(0, 0, 75),
-        Parameters(Mood).value(0, 0, 75),
-        Parameters(Stamina).value(0, 0, 75),
-        player_actions=[
-            Feed(5)
-        ],
-        creature_actions=[
-            ChaseTail(0.1),
-        ]
-    ), 
-    MaturePhase(
-        50, 
-        Parameters(Health).value(0, 0, 100),
-        Parameters(Satiety).value(0, 0, 100),
-        Parameters(Fatigue).value(0, 0, 100),
-        Parameters(Hygiene).value(0, 0, 100),
-        Parameters(Mood).value(0, 0, 100),
-        Parameters(Stamina).value(0, 0, 100),
-        player_actions=[
-            Feed(7)
-        ],
-        creature_actions=[]
-    )
-)
+def __getattr__(name: str) -> Kind:
+    if name in catalog.files:
+        return catalog[name]
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -0,0 +1,151 @@
+"""
+Журнал событий питомца (event sourcing).
+
+Вместо полного State на каждый такт записываются компактные события:
+такты (подряд идущие сливаются в одно событие), изменения возраста
+и действия игрока и питомца. Периодические снимки хранилища позволяют
+восстановить любое прошлое состояние повтором событий от ближайшего снимка.
+"""
+__all__ = [
+    'EventLog',
+]
+
+from array import array
+from bisect import bisect_right
+from typing import Iterable
+from .actions import Action, NoAction, apply_action
+from .kind import Creature
+from .parameters import RangeTable
+
+
+# коды событий; AMOUNT - величина следующего действия игрока
+TICK, AGE, PLAYER, CREATURE, AMOUNT = range(5)
+
+
+class EventLog:
+    """Журнал событий питомца со снимками каждые interval событий.
+
+    Событие - код (1 байт) и аргумент (float64): число тактов, новый
+    возраст, номер прототипа действия в возрастном периоде или его величина.
+    Состояние на такт t - после t тактов и всех событий до следующего такта.
+    """
+
+    def __init__(self, creature: Creature, interval: int = 256):
+        self.creature = creature
+        self.interval = interval
+        self.codes = array('B')
+        self.args = array('d')
+        self.ticks = 0
+        # снимки: такт, позиция в журнале, возраст, значения и диапазоны хранилища
+        self.snapshots: list[tuple[int, int, int, array, RangeTable]] = []
+        self.__snapshot_ticks: list[int] = []
+        self.snapshot()
+
+    @classmethod
+    def attach(cls, creature: Creature, interval: int = 256) -> 'EventLog':
+        """Включение журнала событий вместо истории состояний питомца."""
+        creature.journal = cls(creature, interval)
+        return creature.journal
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    @property
+    def nbytes(self) -> int:
+        """Объём событий и снимков, байт."""
+        events = len(self.codes) * (self.codes.itemsize + self.args.itemsize)
+        return events + sum(
+            len(data) * data.itemsize for *_, data, _ in self.snapshots
+        )
+
+    def snapshot(self) -> None:
+        """Полный снимок хранилища питомца."""
+        creature = self.creature
+        storage = creature.storage
+        self.snapshots.append(
+            (self.ticks, len(self.codes), creature.age, array('d', storage.data), storage.ranges)
+        )
+        self.__snapshot_ticks.append(self.ticks)
+
+    def __append(self, code: int, arg: float, check: bool = True) -> None:
+        """Запись события; снимок - только после завершённой группы событий."""
+        self.codes.append(code)
+        self.args.append(arg)
+        if check and len(self.codes) - self.snapshots[-1][1] >= self.interval:
+            self.snapshot()
+
+    def tick(self, count: int = 1) -> None:
+        self.ticks += count
+        # такты после снимка не сливаются с событием до него
+        if len(self.codes) > self.snapshots[-1][1] and self.codes[-1] == TICK:
+            self.args[-1] += count
+        else:
+            self.__append(TICK, count)
+
+    def age(self, age: int) -> None:
+        self.__append(AGE, age)
+
+    def action(self, prototype: Action, amount: float = None) -> None:
+        """Действие игрока или питомца текущего возрастного периода."""
+        self.actions(((prototype, amount),))
+
+    def actions(self, items: Iterable[tuple[Action, float | None]]) -> None:
+        """Уже выполненные действия (apply_actions) - снимок после всех."""
+        phase = self.creature.kind[self.creature.age]
+        for prototype, amount in items:
+            if prototype in phase.player_actions:
+                if amount is not None:
+                    self.__append(AMOUNT, amount, False)
+                self.__append(PLAYER, phase.player_actions.index(prototype), False)
+            elif prototype in phase.creature_actions:
+                self.__append(CREATURE, phase.creature_actions.index(prototype), False)
+            elif not isinstance(prototype, NoAction):
+                raise ValueError(f'{prototype.name} is not an action of the current phase.')
+        if len(self.codes) - self.snapshots[-1][1] >= self.interval:
+            self.snapshot()
+
+    def rebuild(self, tick: int = None) -> Creature:
+        """Новый питомец в состоянии на такт tick (по умолчанию - текущее)."""
+        if tick is None:
+            tick = self.ticks
+        if not 0 <= tick <= self.ticks:
+            raise IndexError(f'{tick} is out of journal')
+        done, position, age, data, ranges = self.snapshots[
+            bisect_right(self.__snapshot_ticks, tick) - 1
+        ]
+        creature = Creature(self.creature.kind, self.creature.name, age)
+        creature.storage.data[:] = data
+        creature.storage.ranges = ranges
+        kind, codes, args = creature.kind, self.codes, self.args
+        amount = None
+        for position in range(position, len(codes)):
+            code, arg = codes[position], args[position]
+            if code == TICK:
+                if done + arg > tick:
+                    creature.advance(tick - done)
+                    break
+                creature.advance(int(arg))
+                done += int(arg)
+            elif code == AGE:
+                creature.age = int(arg)
+            elif code == AMOUNT:
+                amount = arg
+            elif code == PLAYER:
+                action = kind[creature.age].player_actions[int(arg)]
+                if not _replay(creature, action, amount):
+                    apply_action(creature, action, amount)
+                amount = None
+            else:
+                # действия питомца без effects() не меняют параметров - пропуск
+                _replay(creature, kind[creature.age].creature_actions[int(arg)], None)
+        return creature
+
+
+def _replay(creature: Creature, action: Action, amount: float | None) -> bool:
+    """Повтор действия по effects() - без побочных эффектов do()."""
+    effects = action.effects(amount)
+    if effects is None:
+        return False
+    for cls, delta in effects.items():
+        creature.parameters[cls].value += delta
+    return True
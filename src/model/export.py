@@ -0,0 +1,250 @@
+"""
+Поколоночный экспорт истории питомца для анализа.
+
+Файл - блоки (chunks) строк; внутри блока каждый столбец
+(номер такта, возраст, по столбцу на член Parameters) сжат отдельно.
+Индекс блоков записывается в конце файла, поэтому чтение загружает
+и распаковывает только запрошенные столбцы и диапазоны строк.
+"""
+__all__ = [
+    'ColumnWriter', 'ColumnReader', 'export_history',
+]
+
+import mmap
+import os
+import struct
+import zlib
+from array import array
+from pathlib import Path
+from typing import Iterable, Iterator, Sequence
+from .history import History
+from .parameters import Parameters
+from .persistence import HistoryFile
+
+
+MAGIC = b'TMGC'
+VERSION = 1
+
+# magic, версия, число столбцов
+_HEADER = struct.Struct('<4sHH')
+_LENGTH = struct.Struct('<H')
+# первая строка блока, строк в блоке
+_CHUNK = struct.Struct('<qq')
+# смещение и длина сжатого столбца
+_BLOCK = struct.Struct('<QQ')
+# смещение индекса блоков, magic
+_TAIL = struct.Struct('<Q4s')
+
+# столбцы истории: имя -> код типа array
+HISTORY_COLUMNS: dict[str, str] = {
+    'tick': 'q',
+    'age': 'q',
+    **{member.name: 'd' for member in Parameters},
+}
+
+
+class ColumnWriter:
+    """Потоковая запись столбцов блоками по chunk строк.
+
+    Файл пишется во временный и заменяет path при close(),
+    поэтому незавершённый экспорт не оставляет повреждённого файла.
+    """
+
+    def __init__(
+            self,
+            path: str | os.PathLike,
+            columns: dict[str, str],
+            chunk: int = 1 << 16,
+            level: int = 6
+    ):
+        if chunk < 1:
+            raise ValueError('Chunk must be positive.')
+        self.path = Path(path)
+        self.columns = dict(columns)
+        self.chunk = chunk
+        self.level = level
+        self.rows = 0
+        # индекс: (первая строка, строк, [(смещение, длина)] по столбцам)
+        self.__index: list[tuple[int, int, list[tuple[int, int]]]] = []
+        self.__buffers = {
+            name: array(typecode) for name, typecode in self.columns.items()
+        }
+        self.__temp = self.path.with_name(self.path.name + '.tmp')
+        self.__file = open(self.__temp, 'wb')
+        header = bytearray(_HEADER.pack(MAGIC, VERSION, len(self.columns)))
+        for name, typecode in self.columns.items():
+            data = name.encode('utf-8')
+            header += _LENGTH.pack(len(data)) + data + typecode.encode('ascii')
+        self.__file.write(header)
+
+    def write(self, columns: dict[str, Sequence[float]]) -> None:
+        """Добавление строк: значения каждого столбца одинаковой длины."""
+        lengths = {len(values) for values in columns.values()}
+        if columns.keys() != self.columns.keys() or len(lengths) != 1:
+            raise ValueError('All columns of equal length are required.')
+        for name, values in columns.items():
+            self.__buffers[name].extend(values)
+        while len(self.__buffers[next(iter(self.columns))]) >= self.chunk:
+            self.__flush(self.chunk)
+
+    def __flush(self, rows: int) -> None:
+        """Запись первых rows буферизованных строк одним блоком."""
+        blocks = []
+        for name, buffer in self.__buffers.items():
+            data = zlib.compress(buffer[:rows].tobytes(), self.level)
+            blocks.append((self.__file.tell(), len(data)))
+            self.__file.write(data)
+            del buffer[:rows]
+        self.__index.append((self.rows, rows, blocks))
+        self.rows += rows
+
+    def close(self) -> None:
+        if self.__file.closed:
+            return
+        rest = len(self.__buffers[next(iter(self.columns))])
+        if rest:
+            self.__flush(rest)
+        footer = self.__file.tell()
+        index = bytearray(struct.pack('<Q', len(self.__index)))
+        for first, rows, blocks in self.__index:
+            index += _CHUNK.pack(first, rows)
+            for offset, length in blocks:
+                index += _BLOCK.pack(offset, length)
+        self.__file.write(index + _TAIL.pack(footer, MAGIC))
+        self.__file.flush()
+        os.fsync(self.__file.fileno())
+        self.__file.close()
+        os.replace(self.__temp, self.path)
+
+    def __enter__(self) -> 'ColumnWriter':
+        return self
+
+    def __exit__(self, exc_type, *exc_info) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.__file.close()
+            self.__temp.unlink(missing_ok=True)
+
+
+class ColumnReader:
+    """Чтение поколоночного файла: только нужные столбцы и строки."""
+
+    def __init__(self, path: str | os.PathLike):
+        self.file = open(path, 'rb')
+        self.mmap = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count = _HEADER.unpack_from(self.mmap)
+        footer, tail = _TAIL.unpack_from(self.mmap, len(self.mmap) - _TAIL.size)
+        if magic != MAGIC or tail != MAGIC or version > VERSION:
+            self.close()
+            raise ValueError(f'{path} is not a columnar history.')
+        offset = _HEADER.size
+        self.columns: dict[str, str] = {}
+        for _ in range(count):
+            length, = _LENGTH.unpack_from(self.mmap, offset)
+            offset += _LENGTH.size
+            name = self.mmap[offset:offset + length].decode('utf-8')
+            offset += length
+            self.columns[name] = chr(self.mmap[offset])
+            offset += 1
+        chunks, = struct.unpack_from('<Q', self.mmap, footer)
+        offset = footer + 8
+        # блоки: (первая строка, строк, {столбец: (смещение, длина)})
+        self.chunks: list[tuple[int, int, dict[str, tuple[int, int]]]] = []
+        for _ in range(chunks):
+            first, rows = _CHUNK.unpack_from(self.mmap, offset)
+            offset += _CHUNK.size
+            blocks = {}
+            for name in self.columns:
+                blocks[name] = _BLOCK.unpack_from(self.mmap, offset)
+                offset += _BLOCK.size
+            self.chunks.append((first, rows, blocks))
+        self.rows = sum(rows for _, rows, _ in self.chunks)
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def iter_chunks(
+            self,
+            columns: Iterable[str] = None,
+            start: int = 0,
+            stop: int = None
+    ) -> Iterator[dict[str, array]]:
+        """Строки [start, stop) по блокам - память не зависит от длины истории."""
+        names = list(self.columns if columns is None else columns)
+        for name in names:
+            if name not in self.columns:
+                raise KeyError(name)
+        stop = self.rows if stop is None else min(stop, self.rows)
+        for first, rows, blocks in self.chunks:
+            if first + rows <= start or first >= stop:
+                continue
+            low, high = max(start - first, 0), min(stop - first, rows)
+            part = {}
+            for name in names:
+                offset, length = blocks[name]
+                values = array(self.columns[name])
+                values.frombytes(zlib.decompress(self.mmap[offset:offset + length]))
+                part[name] = values[low:high]
+            yield part
+
+    def read(
+            self,
+            columns: Iterable[str] = None,
+            start: int = 0,
+            stop: int = None
+    ) -> dict[str, array]:
+        """Строки [start, stop) запрошенных столбцов."""
+        names = list(self.columns if columns is None else columns)
+        result = {name: array(self.columns[name]) for name in names}
+        for part in self.iter_chunks(names, start, stop):
+            for name, values in part.items():
+                result[name].extend(values)
+        return result
+
+    def close(self) -> None:
+        self.mmap.close()
+        self.file.close()
+
+    def __enter__(self) -> 'ColumnReader':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def export_history(
+        history: History | HistoryFile,
+        path: str | os.PathLike,
+        chunk: int = 1 << 16
+) -> int:
+    """Экспорт истории в поколоночный файл; возвращает число строк.
+
+    История читается срезами по chunk строк без создания State.
+    """
+    if isinstance(history, History):
+        first = history.total - len(history)
+
+        def ticks(start: int, stop: int) -> range:
+            return range(first + start, first + stop)
+
+        ages = history.ages.view()
+    else:
+        # в файле возможны пропуски тактов между сохранениями
+        ticks = history.tick_range
+        ages = history.ages
+    columns = {
+        member.name: history.get_param(member.value) for member in Parameters
+    }
+    rows = len(ages)
+    with ColumnWriter(path, HISTORY_COLUMNS, chunk) as writer:
+        for start in range(0, rows, chunk):
+            stop = min(start + chunk, rows)
+            part = {
+                'tick': ticks(start, stop),
+                'age': array('q', map(int, ages[start:stop])),
+            }
+            for name, values in columns.items():
+                part[name] = values[start:stop]
+            writer.write(part)
+    return rows
@@ -0,0 +1,10 @@
+"""
+Игровое время. Единица измерения - ИД (игровой день).
+"""
+__all__ = [
+    'TICKS_PER_DAY',
+]
+
+
+# число обновлений параметров питомца за 1 ИД (ТЗ 3г)
+TICKS_PER_DAY: int = 1440
@@ -0,0 +1,327 @@
+__all__ = [
+    'State', 'History', 'RingBuffer', 'Aggregate'
+]
+
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Type
+from .gametime import TICKS_PER_DAY
+from .parameters import Parameters
+
+
+# memento -> originator(class Creature)
+class State:
+    """Состояние питомца: возраст и значения параметров в порядке Parameters.
+    
+    Запись фиксированной структуры; значение параметра - state[класс параметра] 
+    или state.имя_параметра.
+    """
+    __slots__ = ('age', 'values')
+
+    def __init__(self, age: int, values: Iterable[float] = None):
+        self.age = age
+        if values is None:
+            self.values = array('d', bytes(8 * len(Parameters)))
+        else:
+            self.values = array('d', values)
+
+    def __getitem__(self, parameter: Type) -> float:
+        return self.values[parameter.index]
+
+    def __setitem__(self, parameter: Type, value: float) -> None:
+        self.values[parameter.index] = value
+
+    def __getattr__(self, name: str) -> float:
+        try:
+            return self.values[Parameters[name].value.index]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, State):
+            return NotImplemented
+        return self.age == other.age and self.values == other.values
+
+    def __repr__(self):
+        return '/'.join(
+            [f'age={self.age}'] 
+            + [f'{member.name}={value}' for member, value in zip(Parameters, self.values)]
+        )
+
+
+@dataclass(frozen=True)
+class Aggregate:
+    """Сводка параметра за диапазон возрастов."""
+    ticks: int
+    min: float
+    max: float
+    mean: float
+    # тактов ниже порога (History.thresholds) или None без порога
+    below: int | None = None
+
+
+class RingBuffer:
+    """Кольцевой буфер фиксированной ёмкости для чисел одного типа.
+    
+    Каждый элемент записывается дважды - в позиции i и i + capacity, 
+    поэтому последние элементы всегда лежат в памяти подряд 
+    и доступны через memoryview без копирования.
+    Память выделяется при первой записи.
+    """
+    __slots__ = ('typecode', 'capacity', 'data', 'head', 'size')
+
+    def __init__(self, typecode: str, capacity: int):
+        if capacity < 1:
+            raise ValueError('Capacity must be positive.')
+        self.typecode = typecode
+        self.capacity = capacity
+        self.data: array = None
+        self.head = 0
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def append(self, item: float) -> float | None:
+        """Добавление элемента. Возвращает вытесненный элемент или None."""
+        data, head, capacity = self.data, self.head, self.capacity
+        if data is None:
+            data = self.data = array(self.typecode, [0]) * (2 * capacity)
+        evicted = None
+        if self.size == capacity:
+            evicted = data[head]
+        else:
+            self.size += 1
+        data[head] = data[head + capacity] = item
+        self.head = (head + 1) % capacity
+        return evicted
+
+    def view(self) -> memoryview:
+        """Элементы от старых к новым - без копирования."""
+        if self.data is None:
+            return memoryview(array(self.typecode))
+        start = (self.head - self.size) % self.capacity
+        return memoryview(self.data)[start:start + self.size]
+
+
+class _Block:
+    """Накопитель сводки (min/max/mean, тактов ниже порога) по блоку вытесненных тактов."""
+    __slots__ = ('age', 'count', 'mins', 'maxs', 'sums', 'below', 'thresholds')
+
+    def __init__(self, age: int, values: list[float], thresholds: list[float | None]):
+        self.age = age
+        self.count = 1
+        self.mins = list(values)
+        self.maxs = list(values)
+        self.sums = list(values)
+        self.thresholds = thresholds
+        self.below = [
+            int(limit is not None and value < limit)
+            for value, limit in zip(values, thresholds)
+        ]
+
+    def add(self, values: list[float]) -> None:
+        self.count += 1
+        for i, value in enumerate(values):
+            if value < self.mins[i]:
+                self.mins[i] = value
+            elif value > self.maxs[i]:
+                self.maxs[i] = value
+            self.sums[i] += value
+            limit = self.thresholds[i]
+            if limit is not None and value < limit:
+                self.below[i] += 1
+
+
+# caretaker -> опекун для State
+class History:
+    """История состояний питомца.
+    
+    Последние capacity тактов хранятся целиком - по столбцу на параметр 
+    и на возраст. Более старые такты сворачиваются в блоки по block тактов 
+    (min/max/mean); хранится не более retention последних блоков.
+    Память не растёт со временем жизни питомца.
+
+    Для параметров из thresholds блоки хранят и число тактов ниже порога
+    (например, критического уровня), что позволяет query() отвечать
+    по сводкам без просмотра отдельных тактов.
+    """
+
+    def __init__(
+            self,
+            capacity: int = TICKS_PER_DAY,
+            block: int = TICKS_PER_DAY // 24,
+            retention: int = 7 * 24,
+            thresholds: dict[Type, float] = None
+    ):
+        self.block = block
+        self.thresholds: dict[Type, float] = dict(thresholds or {})
+        # всего сохранённых состояний, включая вытесненные
+        self.total = 0
+        self.ages = RingBuffer('l', capacity)
+        self.columns = {
+            member.value: RingBuffer('d', capacity) for member in Parameters
+        }
+        self.summary_ages = RingBuffer('l', retention)
+        # тактов в блоке: меньше block, если блок закрыт сменой возраста
+        self.summary_counts = RingBuffer('l', retention)
+        # суммы значений по блокам - для среднего за диапазон без умножений
+        self.summary_totals = {
+            member.value: RingBuffer('d', retention) for member in Parameters
+        }
+        self.summary = {
+            member.value: (
+                RingBuffer('d', retention), 
+                RingBuffer('d', retention), 
+                RingBuffer('d', retention)
+            )
+            for member in Parameters
+        }
+        self.summary_below = {
+            cls: RingBuffer('l', retention) for cls in self.thresholds
+        }
+        self.__limits = [self.thresholds.get(cls) for cls in self.columns]
+        self.__block: _Block = None
+
+    def __len__(self) -> int:
+        return len(self.ages)
+
+    def __iter__(self) -> Iterator[State]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def __getitem__(self, index: int) -> State:
+        """Состояние из последних capacity тактов."""
+        return State(
+            self.ages.view()[index],
+            (column.view()[index] for column in self.columns.values())
+        )
+
+    def __repr__(self):
+        return f'<History: {len(self)} ticks, {len(self.summary_ages)} blocks>'
+
+    def append(self, state: State) -> None:
+        """Добавление состояния."""
+        self.total += 1
+        evicted_age = self.ages.append(state.age)
+        evicted = [
+            column.append(value)
+            for column, value in zip(self.columns.values(), state.values)
+        ]
+        if evicted_age is not None:
+            self.__downsample(evicted_age, evicted)
+
+    def __downsample(self, age: int, values: list[float]) -> None:
+        """Сворачивание вытесненного такта в текущий блок сводки."""
+        block = self.__block
+        if block is not None and block.age != age:
+            # блок не переходит через границу ИД - запросы по возрасту точные
+            self.__flush()
+            block = None
+        if block is None:
+            self.__block = _Block(age, values, self.__limits)
+        else:
+            block.add(values)
+        if self.__block.count == self.block:
+            self.__flush()
+
+    def __flush(self) -> None:
+        """Перенос текущего блока в сводку."""
+        block = self.__block
+        self.summary_ages.append(block.age)
+        self.summary_counts.append(block.count)
+        for i, (mins, maxs, means) in enumerate(self.summary.values()):
+            mins.append(block.mins[i])
+            maxs.append(block.maxs[i])
+            means.append(block.sums[i] / block.count)
+        for total, value in zip(self.summary_totals.values(), block.sums):
+            total.append(value)
+        for i, cls in enumerate(self.columns):
+            if cls in self.summary_below:
+                self.summary_below[cls].append(block.below[i])
+        self.__block = None
+
+    def get_param(self, parameter: Type) -> memoryview:
+        """История изменений отдельного параметра - без копирования."""
+        return self.columns[parameter].view()
+
+    def get_summary(self, parameter: Type) -> tuple[memoryview, memoryview, memoryview]:
+        """Сводка (min, max, mean) по блокам более старых тактов."""
+        return tuple(buffer.view() for buffer in self.summary[parameter])
+
+
+    def __age_slice(self, ages: memoryview, span: tuple[int, int] | None) -> slice:
+        """Индексы элементов с возрастом из span (возраст не убывает)."""
+        if span is None:
+            return slice(0, len(ages))
+        low, high = span
+        return slice(bisect_left(ages, low), bisect_right(ages, high))
+
+    def query(
+            self,
+            *parameters: Type,
+            ages: tuple[int, int] = None
+    ) -> dict[Type, Aggregate | None]:
+        """Сводка параметров за диапазон возрастов ages (включительно).
+
+        Старые такты учитываются по блокам сводки, последние - по отдельным
+        значениям. None - нет тактов в диапазоне.
+        """
+        raw = self.__age_slice(self.ages.view(), ages)
+        blocks = self.__age_slice(self.summary_ages.view(), ages)
+        pending = self.__block
+        if pending is not None and ages is not None and not ages[0] <= pending.age <= ages[1]:
+            pending = None
+        result = {}
+        for parameter in parameters or self.columns:
+            i = parameter.index
+            values = self.columns[parameter].view()[raw]
+            mins, maxs, _ = (buffer.view()[blocks] for buffer in self.summary[parameter])
+            ticks = len(values) + sum(self.summary_counts.view()[blocks])
+            low = [min(values, default=None), min(mins, default=None)]
+            high = [max(values, default=None), max(maxs, default=None)]
+            total = sum(values) + sum(self.summary_totals[parameter].view()[blocks])
+            limit = self.thresholds.get(parameter)
+            below = None
+            if limit is not None:
+                below = sum(1 for value in values if value < limit)
+                below += sum(self.summary_below[parameter].view()[blocks])
+            if pending is not None:
+                ticks += pending.count
+                low.append(pending.mins[i])
+                high.append(pending.maxs[i])
+                total += pending.sums[i]
+                if below is not None:
+                    below += pending.below[i]
+            if not ticks:
+                result[parameter] = None
+                continue
+            result[parameter] = Aggregate(
+                ticks,
+                min(v for v in low if v is not None),
+                max(v for v in high if v is not None),
+                total / ticks,
+                below
+            )
+        return result
+
+    def series(
+            self,
+            parameter: Type,
+            ages: tuple[int, int] = None
+    ) -> Iterable[tuple[int, float, float, float]]:
+        """Точки графика (возраст, min, max, mean): блоки сводки, затем такты.
+
+        Для графиков вместо полных столбцов get_param().
+        """
+        blocks = self.__age_slice(self.summary_ages.view(), ages)
+        mins, maxs, means = (buffer.view()[blocks] for buffer in self.summary[parameter])
+        yield from zip(self.summary_ages.view()[blocks], mins, maxs, means)
+        pending = self.__block
+        if pending is not None and (ages is None or ages[0] <= pending.age <= ages[1]):
+            i = parameter.index
+            yield pending.age, pending.mins[i], pending.maxs[i], pending.sums[i] / pending.count
+        raw = self.__age_slice(self.ages.view(), ages)
+        for age, value in zip(self.ages.view()[raw], self.columns[parameter].view()[raw]):
+            yield age, value, value, value
@@ -1,12 +1,16 @@
 __all__ = [
-    'Kind', 'MaturePhase', 'Creature'
+    'Kind', 'MaturePhase', 'PhaseTransition', 'Creature'
 ]
 
-from dataclasses import dataclass
-from typing import Type, Iterable
-from random import sample, choice
-from .actions import PlayerAction, CreatureAction, NoAction
+from bisect import bisect_right
+from math import inf
+from typing import Callable, Type, Iterable
+from .actions import Action, PlayerAction, CreatureAction, NoAction, BoundAction
+from .gametime import TICKS_PER_DAY
+from .history import State, History
 from .parameters import *
+from .rng import RandomStream
+from .scheduler import ActionScheduler
 
 
 # DictOfRanges: dict[tuple[int, int], Any]
@@ -22,18 +26,53 @@ class DictOfRanges(dict):
             ):
                 raise ValueError('Invalid data type.')
         super().__init__(mappable)
-    
+        # отсортированные левые границы диапазонов для бинарного поиска
+        self._ranges: list[tuple[int, int]] = sorted(self)
+        self._lefts: list[int] = [left for left, _ in self._ranges]
+        # последний найденный диапазон: (left, right, значение)
+        self._last: tuple = None
+
+    def _lookup(self, key: int) -> tuple:
+        """Диапазон и значение для key: (left, right, значение).
+
+        Результат возвращается, а не читается повторно из общего _last:
+        вид используют несколько потоков (часы, интерфейс).
+        """
+        last = self._last
+        if last is not None and last[0] <= key <= last[1]:
+            return last
+        i = bisect_right(self._lefts, key) - 1
+        if i >= 0:
+            left, right = self._ranges[i]
+            if key <= right:
+                last = self._last = left, right, super().__getitem__((left, right))
+                return last
+        raise KeyError(f'{key} is out of ranges')
+
+    def find(self, key: int) -> tuple[int, int]:
+        """Диапазон, содержащий целое значение key."""
+        left, right, _ = self._lookup(key)
+        return left, right
+
+    def position(self, key: int) -> int:
+        """Номер диапазона, содержащего key, в порядке возрастания."""
+        i = bisect_right(self._lefts, key) - 1
+        if i >= 0 and key <= self._ranges[i][1]:
+            return i
+        raise KeyError(f'{key} is out of ranges')
+
     def __getitem__(self, key):
         if isinstance(key, int):
-            for left, right in self:
-                if left <= key <= right:
-                    return super().__getitem__((left, right))
-        else:
-            return super().__getitem__(key)
+            return self._lookup(key)[2]
+        return super().__getitem__(key)
 
 class MaturePhase:
     """Возрастной период питомца (фаза зрелости)."""
-        
+    __slots__ = (
+        'days', 'parameters', 'ranges', 
+        'player_actions', 'creature_actions', 'scheduler'
+    )
+
     def __init__(
             self,
             days: int,
@@ -44,8 +83,14 @@ class MaturePhase:
     ):
         self.days = days
         self.parameters = tuple(parameters)
+        # таблица диапазонов: класс параметра -> общий дескриптор Range
+        self.ranges: dict[Type, Range] = {
+            Parameters[param.name].value: param.descriptor for param in parameters
+        }
+        # прототипы действий - общие для всех питомцев
         self.player_actions = tuple(player_actions)
         self.creature_actions = tuple(creature_actions)
+        self.scheduler = ActionScheduler(self.creature_actions)
         # self.coeffs = coeffs
 
 # >>> mf = MaturePhase(5, None)
@@ -57,6 +102,67 @@ class MaturePhase:
 # {'days': 5, 'parameters': (None,)}       
         
 
+class PhaseTransition:
+    """План перехода питомца из возрастного периода source в target.
+    
+    Содержит только различия периодов: новые параметры, параметры
+    с новым начальным значением (ненулевое значение прототипа), 
+    сохраняющие значение параметры с новым диапазоном, а также 
+    добавленные и удалённые прототипы действий.
+    """
+    __slots__ = (
+        'source', 'target', 'added', 'overrides', 'ranges', 'carried',
+        'player_added', 'player_removed', 'creature_added', 'creature_removed',
+        'replan'
+    )
+
+    def __init__(self, source: MaturePhase, target: MaturePhase):
+        self.source = source
+        self.target = target
+        # (класс, значение, min, max)
+        self.added: tuple[tuple[Type, float, float, float], ...] = ()
+        # (позиция в ParameterArray, значение, min, max)
+        self.overrides: tuple[tuple[int, float, float, float], ...] = ()
+        # (позиция в ParameterArray, min, max) - значение сохраняется
+        self.ranges: tuple[tuple[int, float, float], ...] = ()
+        # параметры без изменений
+        self.carried: tuple[Type, ...] = ()
+        # план обновления зависит от набора параметров и их диапазонов
+        self.replan = False
+        for param in target.parameters:
+            cls = Parameters[param.name].value
+            low, high = param.range
+            if cls not in source.ranges:
+                self.added += ((cls, param.value, low, high),)
+                self.replan = True
+                continue
+            changed = source.ranges[cls] is not param.descriptor
+            self.replan = self.replan or changed
+            if param.value:
+                self.overrides += ((cls.index, param.value, low, high),)
+            elif changed:
+                self.ranges += ((cls.index, low, high),)
+            else:
+                self.carried += (cls,)
+        self.player_added, self.player_removed = self.__diff(
+            source.player_actions, target.player_actions
+        )
+        self.creature_added, self.creature_removed = self.__diff(
+            source.creature_actions, target.creature_actions
+        )
+
+    @staticmethod
+    def __diff(
+            old: tuple[Action, ...], 
+            new: tuple[Action, ...]
+    ) -> tuple[tuple[Action, ...], frozenset[Action]]:
+        """Добавленные и удалённые прототипы (сравнение по тождеству)."""
+        return (
+            tuple(action for action in new if not any(action is a for a in old)),
+            frozenset(action for action in old if not any(action is a for a in new)),
+        )
+
+
 class Kind(DictOfRanges):
     """Описывает вид существа с характерными для него параметрами."""
 
@@ -73,62 +179,133 @@ class Kind(DictOfRanges):
             phases[key_range] = phase
             left += phase.days
         super().__init__(phases)
+        self.phases: tuple[MaturePhase, ...] = tuple(mature_phases)
+        # переходы между соседними периодами - заранее, остальные - по запросу
+        self.transitions: dict[tuple[MaturePhase, MaturePhase], PhaseTransition] = {
+            (source, target): PhaseTransition(source, target)
+            for source, target in zip(self.phases, self.phases[1:])
+        }
 
-# memento -> originator(class Creature)
-@dataclass
-class State:
-    """Состояние питомца."""
-    age: int
-    # param1: None
-
-    def __repr__(self):
-        return '/'.join(f'{param}={value}' for param, value in self.__dict__.items())
-
-
-# caretaker -> опекун для State
-class History(list):
-    """История состояний питомца."""
-
-    def get_param(self, parameter: Type) -> list[float]:
-        """История изменений отдельного параметра."""
-        return [getattr(state, parameter.__name__) for state in self]
-    
-
+    def transition(self, source: MaturePhase, target: MaturePhase) -> PhaseTransition:
+        """План перехода между возрастными периодами вида."""
+        key = source, target
+        transition = self.transitions.get(key)
+        if transition is None:
+            transition = self.transitions[key] = PhaseTransition(source, target)
+        return transition
 
 # originator
 class Creature:
     """Описывает питомца - игровое существо. Tamagotchi."""
 
-    def __init__(self, kind: Kind, name: str,):
+    def __init__(
+            self, 
+            kind: Kind, 
+            name: str,
+            age: int = 0,
+            storage: ParameterArray = None,
+            rng: RandomStream = None
+    ):
         self.kind = kind
         self.name = name
-        self.__age: int = 0
+        # собственный поток случайных чисел (model.rng); без него - поток
+        # без зерна, создаётся при первом обращении
+        self.__rng: RandomStream = rng
+        self.__age: int = age
+        # номер и границы текущего возрастного периода
+        self.__phase: int = kind.position(age)
+        self.__bounds: tuple[int, int] = kind.find(age)
         self.parameters: dict[Type, Parameter] = {}
-        params = kind[0].parameters
-        for param in params:
-            cls = Parameters[param.name].value
-            self.parameters[cls] = cls(param.value, param._min, param._max, self)
-        self.player_actions: set[PlayerAction]
-        self.creature_actions: set[CreatureAction] 
+        params = kind[age].parameters
+        if storage is None:
+            self.storage = ParameterArray()
+            for param in params:
+                cls = Parameters[param.name].value
+                self.parameters[cls] = cls(
+                    param.value, param._min, param._max, self, self.storage
+                )
+        else:
+            # представление уже заполненного хранилища (например, строки Population)
+            self.storage = storage
+            for param in params:
+                cls = Parameters[param.name].value
+                self.parameters[cls] = cls.view(storage, self)
+        self.plan = UpdatePlan(self.parameters)
+        self.player_actions: set[BoundAction]
+        self.creature_actions: set[BoundAction] 
         self.__set_actions()
         self.history: History = History()
+        # журнал событий (model.events) вместо истории состояний
+        self.journal = None
+        # получатели изменений за такт: f(питомец, {класс параметра: значение})
+        self.subscribers: list[Callable[['Creature', dict[Type, float]], None]] = []
 
     def __set_actions(self) -> None:
+        phase = self.kind[self.age]
         self.player_actions = {
-            action.__class__(**{**action.__dict__, 'creature': self})
-            for action in self.kind[self.age].player_actions
+            BoundAction(action, self) for action in phase.player_actions
         }
         self.creature_actions = {
-            action.__class__(**{**action.__dict__, 'creature': self})
-            for action in self.kind[self.age].creature_actions
+            BoundAction(action, self) for action in phase.creature_actions
+        }
+        self.scheduler = phase.scheduler
+
+    @property
+    def rng(self) -> RandomStream:
+        """Поток случайных чисел питомца - не зависит от других питомцев."""
+        if self.__rng is None:
+            self.__rng = RandomStream()
+        return self.__rng
+
+    @rng.setter
+    def rng(self, stream: RandomStream) -> None:
+        self.__rng = stream
+
+    def subscribe(self, callback: Callable[['Creature', dict[Type, float]], None]) -> None:
+        """Подписка на изменения параметров - не более одного вызова за такт."""
+        self.subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[['Creature', dict[Type, float]], None]) -> None:
+        self.subscribers.remove(callback)
+
+    def changes(self) -> dict[Type, float]:
+        """Параметры, изменившиеся с прошлого вызова, и их значения."""
+        dirty = self.storage.take_dirty()
+        return {
+            cls: parameter.value
+            for cls, parameter in self.parameters.items()
+            if dirty >> parameter.index & 1
         }
 
+    def _publish(self) -> None:
+        """Передача подписчикам изменений, накопленных с прошлого такта."""
+        if self.subscribers and self.storage.dirty:
+            changes = self.changes()
+            for callback in self.subscribers:
+                callback(self, changes)
+
     def random_action(self):
         """Случайное действие питомца."""
-        action = choice(tuple(self.creature_actions))
-        no_action = NoAction()
-        prob = int(action.rand_coeff * 100)
-        choice(sample([action, no_action], counts=[prob, 100-prob], k=100)).do()
+        action = self.scheduler.draw(self.rng.random)
+        action.do(self)
+        if self.journal is not None:
+            self.journal.action(action)
+
+    def random_actions(self, count: int) -> list[Action]:
+        """Случайные действия питомца на count тактов одной выборкой.
+
+        Выбор совпадает с count вызовами random_action(); возвращаются
+        выполненные действия (без бездействия).
+        """
+        done = [
+            action for action in self.scheduler.draws(count, self.rng.random)
+            if not isinstance(action, NoAction)
+        ]
+        for action in done:
+            action.do(self)
+        if self.journal is not None:
+            self.journal.actions((action, None) for action in done)
+        return done
 
 # >>> for _ in range(20):
 # ...     yasha.random_action()
@@ -156,9 +333,66 @@ class Creature:
 
     def update(self) -> None:
         """Обновление всех параметров Tamagotchi."""
-        for parameter in self.parameters.values():
-            parameter.update()
-        self.save()
+        self._tick()
+        if self.journal is None:
+            self.save()
+        else:
+            self.journal.tick()
+        self._publish()
+
+    def _tick(self) -> None:
+        """Один такт обновления параметров без сохранения состояния."""
+        self.plan.tick()
+
+    def advance(self, ticks: int) -> None:
+        """Обновление параметров на ticks тактов вперёд без сохранения состояний.
+
+        Пока изменения всех параметров за такт постоянны, они применяются
+        одним шагом на весь промежуток; иначе выполняется обычный такт.
+        """
+        self._advance(ticks)
+        self._publish()
+
+    def _advance(self, ticks: int) -> None:
+        """advance() без передачи изменений подписчикам."""
+        if self.journal is not None and ticks > 0:
+            # событие записывается после изменений - снимок журнала их учитывает
+            journal, count = self.journal, ticks
+        else:
+            journal = None
+        parameters = self.parameters.values()
+        while ticks > 0:
+            # входы обновляются раньше зависящих параметров - на такт меньше
+            horizon = min((p.horizon() for p in parameters), default=inf) - 1
+            stride = int(min(ticks, horizon))
+            if stride > 1 and all(p._min <= p.value <= p._max for p in parameters):
+                deltas = [0] * self.storage.size
+                for parameter in parameters:
+                    deltas[parameter.index] = parameter.rate() * stride
+                self.storage.add(deltas)
+                ticks -= stride
+            else:
+                self._tick()
+                ticks -= 1
+        if journal is not None:
+            journal.tick(count)
+
+    def fast_forward(self, days: int) -> None:
+        """Пересчёт питомца за days ИД отсутствия игрока (ТЗ 6в).
+
+        Пошагово обрабатываются только границы возрастных периодов.
+        """
+        target = self.age + days
+        # возраст вне возрастных периодов вида - до пересчёта
+        self.kind.find(target)
+        while self.age < target:
+            _, right = self.kind.find(self.age)
+            end = min(right + 1, target)
+            self._advance((end - self.age) * TICKS_PER_DAY)
+            self.age = end
+        if self.journal is None:
+            self.save()
+        self._publish()
 
     @property
     def age(self) -> int:
@@ -166,27 +400,76 @@ class Creature:
     
     @age.setter
     def age(self, new_age: int):
-        isgrow = self.kind[self.__age] is not self.kind[new_age]
+        left, right = self.__bounds
+        if left <= new_age <= right:
+            self.__age = new_age
+        else:
+            self.__jump(new_age)
+        if self.journal is not None:
+            self.journal.age(new_age)
+
+    def __jump(self, new_age: int) -> None:
+        """Переход в другой возрастной период через все промежуточные.
+        
+        На каждой пройденной границе применяется свой план перехода, 
+        поэтому стоимость зависит от числа границ, а не от числа ИД.
+        """
+        kind = self.kind
+        target = kind.position(new_age)
+        bounds = kind.find(new_age)
+        source = self.__phase
         self.__age = new_age
-        if isgrow:
-            self._grow_up()
-            # print(self.kind[self.__age])     
-        # else:
-        #     ...
-
-    def _grow_up(self) -> None:
-        """Изменение возрастного периода питомца - взросление."""
-        for param in self.kind[self.age].parameters:
-            cls = Parameters[param.name].value
-            value = param.value or self.parameters[cls].value
-            self.parameters[cls] = cls(value, param._min, param._max, self)
-        self.__set_actions()
+        step = 1 if target > source else -1
+        replan = False
+        for i in range(source, target, step):
+            transition = kind.transition(kind.phases[i], kind.phases[i + step])
+            self._grow_up(transition, replan=False)
+            replan = replan or transition.replan
+        # план обновления - один раз после всех границ
+        if replan:
+            self.plan = UpdatePlan(self.parameters)
+        self.__phase, self.__bounds = target, bounds
+
+    def grow(self, days: int = 1) -> int:
+        """Увеличение возраста на days ИД; возвращает число пройденных границ периодов."""
+        phase = self.__phase
+        self.age = self.__age + days
+        return abs(self.__phase - phase)
+
+    def _grow_up(self, transition: PhaseTransition, replan: bool = True) -> None:
+        """Изменение возрастного периода питомца - взросление.
+        
+        Применяются только различия периодов из плана перехода; 
+        replan=False - план обновления перестраивает вызывающий.
+        """
+        storage, parameters = self.storage, self.parameters
+        for index, value, low, high in transition.overrides:
+            storage.put(index, value, low, high)
+        for index, low, high in transition.ranges:
+            storage.put(index, storage.data[index], low, high)
+        for cls, value, low, high in transition.added:
+            if cls in parameters:
+                # параметр остался от более раннего периода
+                storage.put(cls.index, value or parameters[cls].value, low, high)
+            else:
+                parameters[cls] = cls(value, low, high, self, storage)
+        if replan and transition.replan:
+            self.plan = UpdatePlan(parameters)
+        if transition.player_removed or transition.player_added:
+            self.player_actions = {
+                action for action in self.player_actions 
+                if action.prototype not in transition.player_removed
+            } | {BoundAction(action, self) for action in transition.player_added}
+        if transition.creature_removed or transition.creature_added:
+            self.creature_actions = {
+                action for action in self.creature_actions 
+                if action.prototype not in transition.creature_removed
+            } | {BoundAction(action, self) for action in transition.creature_added}
+        self.scheduler = transition.target.scheduler
 
     def save(self) -> State:
         """Сохранение состояния питомца."""
-        state = State(self.age)
-        for cls, parameter in self.parameters.items():
-            setattr(state, cls.__name__, parameter.value)
+        state = State(self.age, self.storage.data[:self.storage.size])
         self.history.append(state)
         return state
 
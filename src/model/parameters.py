@@ -1,6 +1,10 @@
 __all__ = [
     'Parameters', 
     'Parameter',
+    'ParameterArray',
+    'Range',
+    'RangeTable',
+    'UpdatePlan',
     'Health', 
     'Satiety', 
     'Fatigue',
@@ -9,77 +13,349 @@ __all__ = [
     'Stamina'
 ]
 
-from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from array import array
 from enum import Enum
-from functools import cached_property
+from math import ceil, floor, inf
+from typing import Iterable
 
 # переменные для аннотаций
 Creature = None
+Population = None
+
+
+def _clamp(value: float, low: float, high: float) -> float:
+    """Приведение значения к диапазону - как в сеттере Parameter.value."""
+    if value <= low:
+        return low
+    elif high <= value:
+        return high
+    return value
+
+
+class Range:
+    """Диапазон значений параметра - неизменяемый и интернированный.
+    
+    Одинаковые диапазоны - один объект, общий для всех питомцев и видов, 
+    поэтому сравнение - по тождеству, а зависящие от диапазона константы 
+    вычисляются один раз.
+    """
+    __slots__ = ('min', 'max', 'critical')
+    _interned: dict[tuple[float, float], 'Range'] = {}
+
+    def __new__(cls, min: float, max: float):
+        key = float(min), float(max)
+        self = cls._interned.get(key)
+        if self is None:
+            self = object.__new__(cls)
+            object.__setattr__(self, 'min', key[0])
+            object.__setattr__(self, 'max', key[1])
+            # критический уровень - четверть суммы границ (Health по Satiety)
+            object.__setattr__(self, 'critical', (key[0] + key[1]) / 4)
+            cls._interned[key] = self
+        return self
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError('Range is immutable.')
+
+    def __iter__(self):
+        yield self.min
+        yield self.max
+
+    def __reduce__(self):
+        return Range, (self.min, self.max)
+
+    def __repr__(self):
+        return f'Range({self.min}, {self.max})'
+
+
+class RangeTable:
+    """Диапазоны всех параметров питомца в порядке Parameters - интернированная таблица.
+    
+    Таблица общая для всех питомцев в одинаковом возрастном периоде; 
+    замена диапазона возвращает другую таблицу, а не изменяет эту.
+    """
+    __slots__ = ('ranges', 'mins', 'maxs', '_replaced')
+    _interned: dict[tuple[Range, ...], 'RangeTable'] = {}
+
+    def __new__(cls, ranges: Iterable[Range] = None):
+        ranges = tuple(ranges) if ranges is not None else (Range(0, 0),) * len(Parameters)
+        self = cls._interned.get(ranges)
+        if self is None:
+            self = object.__new__(cls)
+            self.ranges = ranges
+            self.mins = array('d', (r.min for r in ranges))
+            self.maxs = array('d', (r.max for r in ranges))
+            # (позиция, диапазон) -> таблица с заменой
+            self._replaced: dict[tuple[int, Range], RangeTable] = {}
+            cls._interned[ranges] = self
+        return self
+
+    def __getitem__(self, index: int) -> Range:
+        return self.ranges[index]
+
+    def replace(self, index: int, range: Range) -> 'RangeTable':
+        """Таблица с диапазоном range в позиции index."""
+        if self.ranges[index] is range:
+            return self
+        key = index, range
+        table = self._replaced.get(key)
+        if table is None:
+            table = self._replaced[key] = RangeTable(
+                self.ranges[:index] + (range,) + self.ranges[index + 1:]
+            )
+        return table
+
+    def __reduce__(self):
+        return RangeTable, (self.ranges,)
+
+
+class ParameterArray:
+    """Значения всех параметров питомца в одном массиве и таблица их диапазонов.
+    
+    Значения - в порядке перечисления Parameters; диапазоны - общая 
+    интернированная RangeTable, поэтому память на диапазоны зависит 
+    от числа видов и периодов, а не от числа питомцев.
+    Записи через методы и Parameter.value отмечают параметры, 
+    значение или диапазон которых действительно изменились.
+    """
+
+    def __init__(self, data: array = None, ranges: RangeTable = None):
+        self.size = len(Parameters)
+        if data is None:
+            data = array('d', bytes(self.size * 8))
+        self.data = data
+        self.ranges: RangeTable = ranges or RangeTable()
+        # биты изменившихся параметров (по Parameter.index)
+        self.dirty = 0
+
+    def put(self, index: int, value: float, min: float, max: float) -> None:
+        """Запись значения (без приведения к диапазону) и диапазона параметра."""
+        data, ranges = self.data, self.ranges
+        table = ranges.replace(index, Range(min, max))
+        if data[index] != value or table is not ranges:
+            self.dirty |= 1 << index
+        data[index] = value
+        self.ranges = table
+
+    def packed(self) -> array:
+        """Значения, минимумы и максимумы подряд: [значения | минимумы | максимумы]."""
+        ranges = self.ranges
+        return array('d', self.data) + ranges.mins + ranges.maxs
+
+    def __assign(self, values: array) -> None:
+        """Запись всех значений с отметкой изменившихся."""
+        data, dirty = self.data, self.dirty
+        for index, (old, new) in enumerate(zip(data, values)):
+            if old != new:
+                dirty |= 1 << index
+        data[:] = values
+        self.dirty = dirty
+
+    def clip(self) -> None:
+        """Приведение всех значений к их диапазонам."""
+        ranges = self.ranges
+        self.__assign(array('d', map(_clamp, self.data, ranges.mins, ranges.maxs)))
+
+    def add(self, deltas: Iterable[float]) -> None:
+        """Изменение всех значений сразу.
+        
+        Приведение к диапазону - только для изменившихся значений, 
+        как при поочерёдном присваивании Parameter.value.
+        """
+        ranges = self.ranges
+        self.__assign(array(
+            'd',
+            (
+                _clamp(value + delta, low, high) if delta else value
+                for value, delta, low, high in zip(
+                    self.data, deltas, ranges.mins, ranges.maxs
+                )
+            )
+        ))
+
+    def take_dirty(self) -> int:
+        """Отметки изменений с прошлого вызова (биты по Parameter.index); сброс отметок."""
+        dirty, self.dirty = self.dirty, 0
+        return dirty
 
 
 class Parameter:
-    """Параметр питомца(существа)"""
+    """Параметр питомца(существа)
+    
+    Представление одной ячейки ParameterArray: значение хранится 
+    в общем для питомца массиве, диапазон - общий дескриптор Range.
+    """
+    __slots__ = ('_data', '_slot', '_storage', 'creature')
     name: str = None
+    # позиция в перечислении Parameters
+    index: int = None
+    # имена параметров, от которых зависит rate()
+    inputs: tuple[str, ...] = ()
     
     def __init__(
             self,
             initial: float, 
             min: float, 
             max: float,  
-            creature: Creature = None
+            creature: Creature = None,
+            storage: ParameterArray = None
     ):
-        self.__value = initial
-        self._min = min
-        self._max = max
+        if storage is None:
+            storage = ParameterArray()
+        self._bind(storage, creature)
+        storage.put(self.index, initial, min, max)
+
+    @classmethod
+    def view(cls, storage: ParameterArray, creature: Creature = None) -> 'Parameter':
+        """Параметр поверх уже заполненного хранилища."""
+        parameter = cls.__new__(cls)
+        parameter._bind(storage, creature)
+        return parameter
+
+    def _bind(self, storage: ParameterArray, creature: Creature) -> None:
+        self._data = storage.data
+        self._storage = storage
+        self._slot = self.index
         self.creature = creature
 
     @property
     def value(self) -> float:
-        return self.__value
+        return self._data[self._slot]
+
+    @property
+    def descriptor(self) -> Range:
+        """Общий дескриптор диапазона параметра."""
+        return self._storage.ranges.ranges[self._slot]
+
+    @property
+    def _min(self) -> float:
+        return self._storage.ranges.mins[self._slot]
+
+    @property
+    def _max(self) -> float:
+        return self._storage.ranges.maxs[self._slot]
     
-    @cached_property
+    @property
     def range(self) -> tuple[float, float]:
-        return (self._min, self._max)
+        descriptor = self.descriptor
+        return (descriptor.min, descriptor.max)
 
     @value.setter
     def value(self, new_value: float) -> None: 
-        if new_value <= self._min:
-            self.__value = self._min
-        elif self._max <= new_value:
-            self.__value = self._max
-        else:
-            self.__value = new_value
-
-    @abstractmethod
+        data, slot = self._data, self._slot
+        descriptor = self._storage.ranges.ranges[slot]
+        low, high = descriptor.min, descriptor.max
+        if new_value <= low:
+            new_value = low
+        elif high <= new_value:
+            new_value = high
+        if data[slot] != new_value:
+            data[slot] = new_value
+            self._storage.dirty |= 1 << slot
+
+    def prepare(self) -> None:
+        """Расчёт констант возрастного периода (вызывается UpdatePlan)."""
+
+    def rate(self) -> float:
+        """Изменение значения параметра за один такт.
+        
+        Зависит только от значений inputs и констант возрастного периода.
+        """
+        return 0
+
+    def horizon(self) -> float:
+        """Число тактов, начиная с текущего, в течение которых rate() не изменится."""
+        return inf
+
     def update(self) -> None:
-        pass
+        """Обновление параметра."""
+        rate = self.rate()
+        if rate:
+            self.value += rate
+
+    @classmethod
+    def rate_column(cls, population: Population) -> Iterable[float] | None:
+        """Изменения параметра за такт у всех питомцев популяции.
+        
+        None - параметр не меняется, как и при нулевом rate().
+        """
+        return None
 
 
 class Health(Parameter):
     """Здоровье - параметр Tamagotchi."""
+    __slots__ = ('_critical',)
     name = 'Health'
+    inputs = ('Satiety',)
 
-    def update(self) -> None:
-        """Обновление параметра."""
+    @staticmethod
+    def _penalty(satiety: float, critical: float) -> float:
+        """Изменение здоровья за такт при данной сытости."""
+        if 0 < satiety < critical:
+            return -1
+        elif satiety == 0:
+            return -2
+        return 0
+
+    def prepare(self) -> None:
+        """Критический уровень сытости для возрастного периода."""
+        self._critical = self.creature.parameters[Satiety].descriptor.critical
+
+    def rate(self) -> float:
+        """Изменение параметра за такт в зависимости от сытости."""
+        return self._penalty(self.creature.parameters[Satiety].value, self._critical)
+
+    @classmethod
+    def rate_column(cls, population: Population) -> list[float]:
+        """Изменения здоровья за такт у всех питомцев популяции."""
+        index = Satiety.index
+        return [
+            cls._penalty(satiety, ranges.ranges[index].critical)
+            for satiety, ranges in zip(population.column(Satiety), population.ranges)
+        ]
+
+    def horizon(self) -> float:
+        """Число тактов до смены режима сытости."""
         satiety = self.creature.parameters[Satiety]
-        critcal = sum(satiety.range) / 4
-        if 0 < satiety.value < critcal:
-            self.value -= 1
-        elif satiety.value == 0:
-            self.value -= 2
+        low, high = satiety.range
+        critical = self._critical
+        value = satiety.value
+        step = -satiety.rate()
+        if step == 0 or value == low:
+            return inf
+        if step < 0 or value > high:
+            return 1
+        # при critical <= 0 штраф возможен только при нулевой сытости
+        if value >= critical and critical > 0:
+            if low >= critical:
+                return inf
+            return floor((value - critical) / step) + 1
+        if value > 0:
+            if low > 0:
+                return inf
+            return ceil(value / step)
+        if value == 0:
+            return 1
+        return inf
 
 
 class Satiety(Parameter):
     """Сытость - параметр Tamagotchi."""
+    __slots__ = ()
     name = 'Satiety'
 
-    def update(self) -> None:
-        """Обновление параметра."""
-        self.value -= 1
+    def rate(self) -> float:
+        """Изменение параметра за такт."""
+        return -1
+
+    @classmethod
+    def rate_column(cls, population: Population) -> list[float]:
+        """Изменения сытости за такт у всех питомцев популяции."""
+        return [-1] * len(population)
 
 class Fatigue(Parameter):
     """Усталость - параметр Tamagotchi."""
+    __slots__ = ()
     name = 'Fatigue'
 
     def update(self) -> None:
@@ -87,6 +363,7 @@ class Fatigue(Parameter):
 
 class Hygiene(Parameter):
     """Чистота - параметр Tamagotchi."""
+    __slots__ = ()
     name = 'Hygiene'
 
     def update(self) -> None:
@@ -94,6 +371,7 @@ class Hygiene(Parameter):
 
 class Mood(Parameter):
     """Настроение - параметр Tamagotchi."""
+    __slots__ = ()
     name = 'Mood'
 
     def update(self) -> None:
@@ -101,6 +379,7 @@ class Mood(Parameter):
 
 class Stamina(Parameter):
     """Выносливость - параметр Tamagotchi."""
+    __slots__ = ()
     name = 'Stamina'
 
     def update(self) -> None:
@@ -115,6 +394,70 @@ Parameters = Enum(
         for cls in Parameter.__subclasses__()
     }
 )
+for index, member in enumerate(Parameters):
+    member.value.index = index
+
+
+class UpdatePlan:
+    """План обновления параметров питомца на возрастной период.
+    
+    Параметры упорядочены по зависимостям (inputs): входы обновляются 
+    раньше зависящих от них параметров, независимо от порядка объявления.
+    rate() пересчитывается, только если изменились значения входов; 
+    постоянные параметры без изменений в план не попадают.
+    """
+
+    def __init__(self, parameters: dict[type, Parameter]):
+        self.order: tuple[Parameter, ...] = self.__sort(parameters)
+        for parameter in self.order:
+            parameter.prepare()
+        # шаги плана: [параметр, входы, значения входов при расчёте rate, rate]
+        self.steps: list[list] = []
+        dependencies = {
+            name for parameter in self.order for name in parameter.inputs
+        }
+        for parameter in self.order:
+            inputs = [
+                parameters[Parameters[name].value] for name in parameter.inputs
+            ]
+            rate = parameter.rate()
+            if rate or inputs or parameter.name in dependencies:
+                self.steps.append(
+                    [parameter, inputs, [p.value for p in inputs], rate]
+                )
+
+    @staticmethod
+    def __sort(parameters: dict[type, Parameter]) -> tuple[Parameter, ...]:
+        """Топологическая сортировка; при равенстве - порядок Parameters."""
+        pending = sorted(parameters.values(), key=lambda p: p.index)
+        for parameter in pending:
+            for name in parameter.inputs:
+                if Parameters[name].value not in parameters:
+                    raise ValueError(f'{parameter.name} requires {name}.')
+        order, done = [], set()
+        while pending:
+            for parameter in pending:
+                if all(name in done for name in parameter.inputs):
+                    break
+            else:
+                names = ', '.join(p.name for p in pending)
+                raise ValueError(f'Cyclic parameter inputs: {names}.')
+            pending.remove(parameter)
+            order.append(parameter)
+            done.add(parameter.name)
+        return tuple(order)
+
+    def tick(self) -> None:
+        """Один такт обновления параметров."""
+        for step in self.steps:
+            parameter, inputs, seen, rate = step
+            if inputs:
+                current = [p.value for p in inputs]
+                if current != seen:
+                    step[2] = current
+                    rate = step[3] = parameter.rate()
+            if rate:
+                parameter.value += rate
 
 
 # >>> Parameters
@@ -0,0 +1,307 @@
+"""
+Сохранение и загрузка питомца (ТЗ 2б).
+
+Снимок питомца - небольшой версионированный двоичный файл, 
+перезаписываемый атомарно. История - отдельный файл <снимок>.hist 
+с записями фиксированного размера, только дописывается 
+и читается через mmap без разбора всего файла. Номера тактов
+записей хранятся в снимке отрезками: (первый такт, первая запись).
+"""
+__all__ = [
+    'dump', 'load', 'open_history', 'HistoryFile',
+]
+
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+from typing import Mapping, Type
+from .history import State
+from .kind import Kind, Creature
+from .parameters import Parameters, UpdatePlan
+from .rng import RandomStream
+from .scheduler import ActionScheduler
+
+
+SNAPSHOT_MAGIC = b'TMGS'
+HISTORY_MAGIC = b'TMGH'
+# 2 - отрезки номеров тактов истории в снимке
+VERSION = 2
+
+# magic, версия, число параметров
+_HEADER = struct.Struct('<4sHH')
+# возраст, всего сохранённых состояний, записей в файле истории
+_COUNTERS = struct.Struct('<qqq')
+_LENGTH = struct.Struct('<H')
+_COUNT = struct.Struct('<I')
+# первый такт отрезка, номер его первой записи в файле истории
+_SEGMENT = struct.Struct('<qq')
+
+
+def _history_path(path: Path) -> Path:
+    return path.with_name(path.name + '.hist')
+
+
+def _pack_str(text: str) -> bytes:
+    data = text.encode('utf-8')
+    return _LENGTH.pack(len(data)) + data
+
+
+class _Reader:
+    """Последовательное чтение двоичного снимка."""
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.offset = 0
+
+    def unpack(self, fmt: struct.Struct) -> tuple:
+        values = fmt.unpack_from(self.data, self.offset)
+        self.offset += fmt.size
+        return values
+
+    def str(self) -> str:
+        length, = self.unpack(_LENGTH)
+        text = self.data[self.offset:self.offset + length].decode('utf-8')
+        self.offset += length
+        return text
+
+    def doubles(self, count: int) -> array:
+        values = array('d')
+        values.frombytes(self.data[self.offset:self.offset + 8*count])
+        self.offset += 8 * count
+        return values
+
+
+def _read_snapshot(path: Path) -> dict:
+    reader = _Reader(path.read_bytes())
+    magic, version, count = reader.unpack(_HEADER)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError(f'{path} is not a creature snapshot.')
+    if version > VERSION:
+        raise ValueError(f'Unsupported snapshot version {version}.')
+    snapshot = {'kind': reader.str(), 'name': reader.str()}
+    snapshot['age'], snapshot['total'], snapshot['records'] = reader.unpack(_COUNTERS)
+    snapshot['parameters'] = [reader.str() for _ in range(count)]
+    snapshot['data'] = reader.doubles(3 * count)
+    snapshot['actions'] = [
+        {reader.str() for _ in range(reader.unpack(_LENGTH)[0])}
+        for _ in range(2)
+    ]
+    if version >= 2:
+        snapshot['segments'] = [
+            reader.unpack(_SEGMENT) for _ in range(reader.unpack(_COUNT)[0])
+        ]
+    else:
+        # без пропусков записи заканчиваются последним сохранённым тактом
+        snapshot['segments'] = [(snapshot['total'] - snapshot['records'], 0)]
+    return snapshot
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Запись файла целиком: временный файл + os.replace."""
+    temp = path.with_name(path.name + '.tmp')
+    with open(temp, 'wb') as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp, path)
+
+
+def dump(creature: Creature, path: str | os.PathLike) -> None:
+    """Сохранение питомца.
+    
+    В файл истории дописываются только состояния, сохранённые 
+    после предыдущего вызова. Снимок записывается последним, 
+    поэтому после сбоя остаётся предыдущее согласованное сохранение.
+    """
+    path = Path(path)
+    count = len(Parameters)
+    names = [member.name for member in Parameters]
+    saved_total, records, segments = 0, 0, []
+    if path.exists():
+        snapshot = _read_snapshot(path)
+        if snapshot['parameters'] != names:
+            raise ValueError('Snapshot parameters do not match, save to a new file.')
+        saved_total, records = snapshot['total'], snapshot['records']
+        segments = snapshot['segments']
+
+    history = creature.history
+    record = array('d')
+    first = max(saved_total, history.total - len(history))
+    offset = first - (history.total - len(history))
+    ages = history.ages.view()[offset:]
+    columns = [history.get_param(member.value)[offset:] for member in Parameters]
+    for i, age in enumerate(ages):
+        record.append(age)
+        record.extend(column[i] for column in columns)
+    if ages and (not segments or first != saved_total):
+        # первое сохранение или пропуск: состояния, вытесненные из истории
+        # между сохранениями, в файл не попали
+        segments = segments + [(first, records)]
+
+    history_path = _history_path(path)
+    record_size = 8 * (count + 1)
+    with open(history_path, 'ab+') as file:
+        if file.seek(0, os.SEEK_END) == 0:
+            file.write(_HEADER.pack(HISTORY_MAGIC, VERSION, count))
+        # хвост от прерванного сохранения отбрасывается
+        file.truncate(_HEADER.size + records * record_size)
+        file.seek(0, os.SEEK_END)
+        record.tofile(file)
+        file.flush()
+        os.fsync(file.fileno())
+    records += len(ages)
+
+    data = bytearray(_HEADER.pack(SNAPSHOT_MAGIC, VERSION, count))
+    data += _pack_str(creature.kind.name) + _pack_str(creature.name)
+    data += _COUNTERS.pack(creature.age, history.total, records)
+    for name in names:
+        data += _pack_str(name)
+    data += bytes(creature.storage.packed())
+    for actions in (creature.player_actions, creature.creature_actions):
+        data += _LENGTH.pack(len(actions))
+        for action in actions:
+            data += _pack_str(action.prototype.__class__.__name__)
+    data += _COUNT.pack(len(segments))
+    for segment in segments:
+        data += _SEGMENT.pack(*segment)
+    _write_atomic(path, bytes(data))
+
+
+def load(
+        path: str | os.PathLike,
+        kinds: Mapping[str, Kind],
+        rng: RandomStream = None
+) -> Creature:
+    """Загрузка питомца. kinds - виды питомцев по Kind.name."""
+    snapshot = _read_snapshot(Path(path))
+    kind = kinds[snapshot['kind']]
+    creature = Creature(kind, snapshot['name'], snapshot['age'], rng=rng)
+    data, count = snapshot['data'], len(snapshot['parameters'])
+    for i, name in enumerate(snapshot['parameters']):
+        if name in Parameters.__members__:
+            creature.storage.put(
+                Parameters[name].value.index, 
+                data[i], data[i + count], data[i + 2*count]
+            )
+    creature.plan = UpdatePlan(creature.parameters)
+    player, other = snapshot['actions']
+    creature.player_actions = {
+        action for action in creature.player_actions 
+        if action.prototype.__class__.__name__ in player
+    }
+    creature.creature_actions = {
+        action for action in creature.creature_actions 
+        if action.prototype.__class__.__name__ in other
+    }
+    if len(creature.creature_actions) != len(kind[creature.age].creature_actions):
+        # порядок возрастного периода, а не множества - выбор воспроизводим
+        creature.scheduler = ActionScheduler(
+            action for action in kind[creature.age].creature_actions
+            if action.__class__.__name__ in other
+        )
+    creature.history.total = snapshot['total']
+    return creature
+
+
+class HistoryFile:
+    """Полная история питомца из файла - через mmap, без разбора записей."""
+
+    def __init__(
+            self,
+            path: str | os.PathLike,
+            records: int = None,
+            segments: list[tuple[int, int]] = None
+    ):
+        self.__data = None
+        # отрезки (первый такт, первая запись); без снимка - такты с 0
+        self.segments: list[tuple[int, int]] = segments or [(0, 0)]
+        self.file = open(path, 'rb')
+        try:
+            self.mmap = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except BaseException:
+            self.file.close()
+            raise
+        try:
+            magic, version, count = _HEADER.unpack_from(self.mmap)
+            if magic != HISTORY_MAGIC or version > VERSION:
+                raise ValueError(f'{path} is not a creature history.')
+            self.width = count + 1
+            available = (len(self.mmap) - _HEADER.size) // (8 * self.width)
+            self.records = available if records is None else min(records, available)
+            # хвост от прерванной записи (в том числе не кратный 8 байтам) - не читается
+            end = _HEADER.size + self.records * 8 * self.width
+            self.__data = memoryview(self.mmap)[_HEADER.size:end].cast('d')
+        except BaseException:
+            self.close()
+            raise
+
+    def __len__(self) -> int:
+        return self.records
+
+    def __getitem__(self, index: int) -> State:
+        if not -self.records <= index < self.records:
+            raise IndexError('History index out of range')
+        index %= self.records
+        row = self.__data[index * self.width:(index + 1) * self.width]
+        return State(int(row[0]), row[1:])
+
+    @property
+    def ages(self) -> memoryview:
+        return self.__data[0::self.width]
+
+    @property
+    def ticks(self) -> array:
+        """Номер такта каждой записи (с учётом пропусков между сохранениями)."""
+        return self.tick_range(0, self.records)
+
+    def tick_range(self, start: int, stop: int) -> array:
+        """Номера тактов записей [start, stop) - по отрезкам, без обхода файла."""
+        stop = min(stop, self.records)
+        ticks = array('q')
+        segments = self.segments
+        i = max(bisect_right([record for _, record in segments], start) - 1, 0)
+        while start < stop and i < len(segments):
+            tick, first = segments[i]
+            end = segments[i + 1][1] if i + 1 < len(segments) else stop
+            end = min(end, stop)
+            if end > start:
+                ticks.extend(range(tick + start - first, tick + end - first))
+                start = end
+            i += 1
+        return ticks
+
+    def get_param(self, parameter: Type) -> memoryview:
+        """История изменений отдельного параметра - без копирования."""
+        return self.__data[parameter.index + 1::self.width]
+
+    def close(self) -> None:
+        """Закрытие файла.
+
+        Столбцы ages и get_param() остаются действительными, пока на них
+        есть ссылки: тогда отображение файла освобождается вместе с последним.
+        """
+        if self.__data is not None:
+            self.__data.release()
+            self.__data = None
+        try:
+            self.mmap.close()
+        except BufferError:
+            # есть выданные столбцы - mmap закроется при их освобождении
+            pass
+        self.file.close()
+
+    def __enter__(self) -> 'HistoryFile':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def open_history(path: str | os.PathLike) -> HistoryFile:
+    """История, сохранённая вместе со снимком path."""
+    path = Path(path)
+    snapshot = _read_snapshot(path)
+    return HistoryFile(_history_path(path), snapshot['records'], snapshot['segments'])
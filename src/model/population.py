@@ -0,0 +1,227 @@
+__all__ = [
+    'Population',
+]
+
+from array import array
+from time import perf_counter
+from typing import Iterator, Type
+from .actions import Action, NoAction
+from .kind import Kind, Creature, PhaseTransition
+from .parameters import ParameterArray, Range, RangeTable, _clamp
+from .rng import RandomStream
+
+
+class _RowArray(ParameterArray):
+    """ParameterArray строки популяции: таблица диапазонов - в Population.ranges."""
+
+    def __init__(self, data: memoryview, population: 'Population', row: int):
+        self.population = population
+        self.row = row
+        super().__init__(data, population.ranges[row])
+
+    @property
+    def ranges(self) -> RangeTable:
+        return self.population.ranges[self.row]
+
+    @ranges.setter
+    def ranges(self, table: RangeTable) -> None:
+        self.population.ranges[self.row] = table
+
+
+class Population:
+    """Популяция питомцев одного вида - поколоночное обновление параметров.
+
+    Строка матрицы data - значения ParameterArray одного питомца, 
+    поэтому Creature для отдельного питомца создаётся как представление 
+    строки без копирования. Диапазоны - ссылки на общие RangeTable.
+    """
+
+    def __init__(self, kind: Kind, size: int, seed: int = None):
+        self.kind = kind
+        self.size = size
+        # поток питомца index - rng.spawn(index): не зависит от других строк
+        self.rng = RandomStream(seed, kind.name)
+        self.__streams: list[RandomStream | None] = [None] * size
+        prototype = Creature(kind, kind.name)
+        # порядок обновления - как у Creature.update()
+        self.order: tuple[Type, ...] = tuple(
+            type(parameter) for parameter in prototype.plan.order
+        )
+        self.width = len(prototype.storage.data)
+        self.data = prototype.storage.data * size
+        # таблица диапазонов каждого питомца (общие объекты)
+        self.ranges: list[RangeTable] = [prototype.storage.ranges] * size
+        self.ages = array('l', [0]) * size
+        self.last_tick: float = 0.0
+        self.__views: dict[int, Creature] = {}
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index: int) -> Creature:
+        """Питомец популяции - представление строки матрицы."""
+        creature = self.__views.get(index)
+        if creature is None:
+            if not 0 <= index < self.size:
+                raise IndexError('Population index out of range')
+            start = index * self.width
+            row = memoryview(self.data)[start:start + self.width]
+            creature = Creature(
+                self.kind, 
+                str(index), 
+                self.ages[index],
+                _RowArray(row, self, index),
+                self.stream(index)
+            )
+            self.__views[index] = creature
+        return creature
+
+    def stream(self, index: int) -> RandomStream:
+        """Поток случайных чисел питомца index (общий с его представлением)."""
+        stream = self.__streams[index]
+        if stream is None:
+            stream = self.__streams[index] = self.rng.spawn(index)
+        return stream
+
+    def __iter__(self) -> Iterator[Creature]:
+        return (self[index] for index in range(self.size))
+
+    def column(self, parameter: Type) -> array:
+        """Значения параметра у всех питомцев."""
+        return self.data[parameter.index::self.width]
+
+    def range_columns(self, parameter: Type) -> tuple[list[float], list[float]]:
+        """Минимумы и максимумы параметра у всех питомцев."""
+        index = parameter.index
+        return (
+            [table.mins[index] for table in self.ranges],
+            [table.maxs[index] for table in self.ranges],
+        )
+
+    def add(self, parameter: Type, deltas: list[float]) -> None:
+        """Изменение параметра у всех питомцев с приведением к диапазонам."""
+        self.data[parameter.index::self.width] = array(
+            'd',
+            (
+                _clamp(value + delta, low, high) if delta else value
+                for value, delta, low, high in zip(
+                    self.column(parameter), deltas, *self.range_columns(parameter)
+                )
+            )
+        )
+
+    def grow(self, days: int = 1) -> None:
+        """Увеличение возраста всех питомцев на days ИД.
+        
+        Питомцы, одновременно сменившие возрастной период, переводятся 
+        одной операцией на каждую пройденную границу периодов.
+        """
+        kind = self.kind
+        # возраст вне возрастных периодов вида - до изменений
+        kind.find(max(self.ages, default=0) + days)
+        positions = {phase: i for i, phase in enumerate(kind.phases)}
+        moved: dict[tuple[int, int], list[int]] = {}
+        for row, age in enumerate(self.ages):
+            source, target = kind[age], kind[age + days]
+            if source is not target:
+                moved.setdefault((positions[source], positions[target]), []).append(row)
+            self.ages[row] = age + days
+        for (source, target), rows in moved.items():
+            # каждая пройденная граница - своим планом перехода
+            step = 1 if target > source else -1
+            for i in range(source, target, step):
+                self.__transit(
+                    kind.transition(kind.phases[i], kind.phases[i + step]), rows
+                )
+        # представления сменивших период питомцев - как при Creature.age
+        for index, creature in self.__views.items():
+            creature.age = self.ages[index]
+
+    def __transit(self, transition: PhaseTransition, rows: list[int]) -> None:
+        """Запись различий возрастных периодов в строки rows."""
+        values = [(index, value) for index, value, _, _ in transition.overrides]
+        ranges = [(index, Range(low, high)) for index, _, low, high in transition.overrides]
+        ranges += [(index, Range(low, high)) for index, low, high in transition.ranges]
+        for cls, value, low, high in transition.added:
+            # нулевое значение - как у нового параметра или сохранённое
+            if value:
+                values.append((cls.index, value))
+            ranges.append((cls.index, Range(low, high)))
+        data, width = self.data, self.width
+        for index, value in values:
+            if len(rows) == self.size:
+                data[index::width] = array('d', [value]) * self.size
+            else:
+                for row in rows:
+                    data[row * width + index] = value
+        # таблицы диапазонов общие: замена вычисляется один раз на таблицу
+        replaced: dict[RangeTable, RangeTable] = {}
+        for row in rows:
+            table = self.ranges[row]
+            new = replaced.get(table)
+            if new is None:
+                new = table
+                for index, descriptor in ranges:
+                    new = new.replace(index, descriptor)
+                replaced[table] = new
+            self.ranges[row] = new
+        if transition.added:
+            prototype = Creature(self.kind, self.kind.name, self.ages[rows[0]])
+            self.order = tuple(type(parameter) for parameter in prototype.plan.order)
+
+    def tick(self) -> None:
+        """Один такт обновления параметров сразу у всех питомцев."""
+        start = perf_counter()
+        for parameter in self.order:
+            deltas = parameter.rate_column(self)
+            if deltas is not None:
+                self.add(parameter, deltas)
+        self.last_tick = perf_counter() - start
+
+    def random_actions(self, count: int = 1) -> dict[int, list[Action]]:
+        """Случайные действия всех питомцев на count тактов.
+
+        Каждый питомец выбирает из своего потока, поэтому результат
+        не зависит от того, какие строки обрабатываются вместе.
+        Действия с effects() применяются к строке матрицы без создания
+        представления Creature; остальные - через представление.
+        """
+        data, width, views, stream = self.data, self.width, self.__views, self.stream
+        schedulers = {age: self.kind[age].scheduler for age in set(self.ages)}
+        done = {}
+        for index, age in enumerate(self.ages):
+            actions = [
+                action
+                for action in schedulers[age].draws(count, stream(index).random)
+                if not isinstance(action, NoAction)
+            ]
+            if not actions:
+                continue
+            done[index] = actions
+            creature = views.get(index)
+            if creature is not None:
+                # у представления - журнал и учёт изменений
+                for action in actions:
+                    action.do(creature)
+                if creature.journal is not None:
+                    creature.journal.actions((action, None) for action in actions)
+                continue
+            table, start = self.ranges[index], index * width
+            for action in actions:
+                effects = action.effects()
+                if effects is None:
+                    action.do(self[index])
+                    continue
+                for cls, delta in effects.items():
+                    i = start + cls.index
+                    data[i] = _clamp(
+                        data[i] + delta, table.mins[cls.index], table.maxs[cls.index]
+                    )
+        return done
+
+    @property
+    def throughput(self) -> float:
+        """Обновлений питомцев в секунду за последний такт."""
+        if not self.last_tick:
+            return 0.0
+        return self.size / self.last_tick
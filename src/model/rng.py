@@ -0,0 +1,54 @@
+"""
+Воспроизводимые потоки случайных чисел.
+
+Поток питомца выводится из главного зерна и ключей (вид, имя, номер
+в популяции), поэтому не зависит ни от других питомцев, ни от порядка
+и распределения их обработки по потокам и процессам.
+"""
+__all__ = [
+    'RandomStream', 'derive_seed',
+]
+
+import hashlib
+import os
+from random import Random
+
+
+def derive_seed(seed: int, *keys: str) -> int:
+    """Зерно потока: хеш главного зерна и ключей (128 бит)."""
+    digest = hashlib.blake2b(str(seed).encode(), digest_size=16)
+    for key in keys:
+        # длина ключа разделяет ('ab', 'c') и ('a', 'bc')
+        data = str(key).encode()
+        digest.update(len(data).to_bytes(4, 'little') + data)
+    return int.from_bytes(digest.digest(), 'little')
+
+
+class RandomStream(Random):
+    """Независимый поток случайных чисел для главного зерна и ключей.
+
+    Без зерна (seed=None) - зерно из os.urandom, как у random.Random().
+    Потоки для подключей (spawn) не зависят от числа уже выданных значений.
+    """
+
+    def __init__(self, seed: int = None, *keys: str):
+        if seed is None:
+            seed = int.from_bytes(os.urandom(16), 'little')
+        self.root = seed
+        self.keys = tuple(map(str, keys))
+        super().__init__(derive_seed(seed, *self.keys))
+
+    def spawn(self, *keys: str) -> 'RandomStream':
+        """Дочерний поток для подключей."""
+        return type(self)(self.root, *self.keys, *keys)
+
+    def randoms(self, count: int) -> list[float]:
+        """count чисел [0, 1) - то же, что count вызовов random()."""
+        random = self.random
+        return [random() for _ in range(count)]
+
+    def __reduce__(self):
+        return self.__class__, (self.root, *self.keys), self.getstate()
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__} {"/".join(self.keys) or "-"}>'
@@ -0,0 +1,62 @@
+__all__ = [
+    'ActionScheduler',
+]
+
+from random import random as _random
+from typing import Callable, Iterable
+from .actions import Action, CreatureAction, NoAction
+
+
+# общий для всех питомцев экземпляр бездействия
+NO_ACTION = NoAction()
+
+
+class ActionScheduler:
+    """Выбор случайной активности питомца за O(1) - метод псевдонимов Уолкера.
+    
+    Распределение совпадает с Creature.random_action(): активность 
+    выбирается равновероятно и выполняется с вероятностью rand_coeff, 
+    иначе - бездействие. Таблица строится один раз на возрастной период.
+    """
+
+    def __init__(self, actions: Iterable[CreatureAction]):
+        actions = tuple(actions)
+        weights = [action.rand_coeff / len(actions) for action in actions]
+        weights.append(max(0.0, 1.0 - sum(weights)))
+        self.outcomes: tuple[Action, ...] = actions + (NO_ACTION,)
+        self.size = len(self.outcomes)
+        self.probs, self.aliases = self.__build(weights)
+
+    @staticmethod
+    def __build(weights: list[float]) -> tuple[list[float], list[int]]:
+        """Таблица псевдонимов (алгоритм Воуза)."""
+        size, total = len(weights), sum(weights)
+        scaled = [weight * size / total for weight in weights]
+        probs, aliases = [1.0] * size, list(range(size))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            probs[less], aliases[less] = scaled[less], more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        return probs, aliases
+
+    def draw(self, random: Callable[[], float] = _random) -> Action:
+        """Одна случайная активность (или бездействие)."""
+        u = random() * self.size
+        i = int(u)
+        if u - i < self.probs[i]:
+            return self.outcomes[i]
+        return self.outcomes[self.aliases[i]]
+
+    def draws(self, count: int, random: Callable[[], float] = _random) -> list[Action]:
+        """Случайные активности на count тактов вперёд."""
+        size, probs, aliases, outcomes = self.size, self.probs, self.aliases, self.outcomes
+        result = []
+        append = result.append
+        for _ in range(count):
+            u = random() * size
+            i = int(u)
+            append(outcomes[i] if u - i < probs[i] else outcomes[aliases[i]])
+        return result
@@ -0,0 +1,158 @@
+__all__ = [
+    'SharedMatrix',
+]
+
+from array import array
+from contextlib import contextmanager
+from multiprocessing import resource_tracker, shared_memory
+from time import monotonic, sleep
+from typing import Iterable, Iterator
+from .kind import Creature
+from .parameters import Parameters
+from .population import Population
+
+
+class SharedMatrix:
+    """Значения параметров питомцев в общей памяти процессов.
+
+    Раскладка блока: счётчик поколений и число строк (uint64), затем матрица N×P
+    значений float64 по строкам: строка - питомец, столбец - член
+    перечисления Parameters. Запись защищена seqlock: на время записи
+    поколение нечётное, поэтому читатели в других процессах получают
+    согласованный снимок без блокировок и без pickle.
+    """
+    # поколение и число строк (uint64)
+    HEADER = 16
+
+    def __init__(self, rows: int = None, name: str = None, shared_tracker: bool = None):
+        """rows - создание нового блока, name - подключение к существующему.
+
+        shared_tracker - читатель использует resource_tracker создателя
+        (процесс multiprocessing, запущенный создателем). Иначе подключение
+        снимается с учёта собственного resource_tracker, чтобы блок
+        не удалялся при выходе читателя. None - определить по тому, запущен
+        ли resource_tracker в этом процессе; это неверно для независимого
+        процесса, уже создававшего свою общую память, - в таком процессе
+        значение нужно передавать явно.
+        """
+        self.owner = name is None
+        self.width = len(Parameters)
+        if shared_tracker is None:
+            shared_tracker = resource_tracker._resource_tracker._fd is not None
+        if self.owner:
+            size = self.HEADER + 8 * rows * self.width
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.shm = shared_memory.SharedMemory(name)
+            if not shared_tracker:
+                # блок принадлежит создателю - не удалять его при выходе читателя
+                resource_tracker.unregister(self.shm._name, 'shared_memory')
+        self.__header = self.shm.buf[:self.HEADER]
+        self.__counters = self.__header.cast('Q')
+        if self.owner:
+            self.__counters[1] = rows
+        self.rows = self.__counters[1]
+        size = self.HEADER + 8 * self.rows * self.width
+        self.__raw = self.shm.buf[self.HEADER:size]
+        self.values = self.__raw.cast('d')
+
+    @classmethod
+    def attach(cls, name: str, shared_tracker: bool = None) -> 'SharedMatrix':
+        """Подключение к уже созданной матрице по имени блока."""
+        return cls(name=name, shared_tracker=shared_tracker)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def generation(self) -> int:
+        return self.__counters[0]
+
+    @contextmanager
+    def writing(self) -> Iterator[memoryview]:
+        """Изменение матрицы (один писатель).
+
+        При ошибке записи матрица восстанавливается из копии, поэтому
+        читатели не получают наполовину записанные значения.
+        """
+        backup = bytes(self.__raw)
+        self.__counters[0] += 1
+        try:
+            yield self.values
+        except BaseException:
+            self.__raw[:] = backup
+            raise
+        finally:
+            self.__counters[0] += 1
+
+    def publish(self, population: Population) -> None:
+        """Запись значений параметров популяции - по столбцам."""
+        if len(population) != self.rows:
+            raise ValueError(f'Population has {len(population)} rows, matrix has {self.rows}.')
+        with self.writing() as values:
+            for member in Parameters:
+                index = member.value.index
+                values[index::self.width] = population.column(member.value)
+
+    def publish_creatures(self, creatures: Iterable[Creature]) -> None:
+        """Запись значений параметров отдельных питомцев - по строкам."""
+        width = self.width
+        with self.writing() as values:
+            for row, creature in enumerate(creatures):
+                values[row * width:(row + 1) * width] = creature.storage.data[:width]
+
+    def __stable(self, timeout: float) -> int:
+        """Ожидание чётного поколения (писатель закончил запись).
+
+        Если поколение нечётное и не меняется дольше timeout секунд,
+        писатель, вероятно, завершился посреди записи - TimeoutError.
+        """
+        counters = self.__counters
+        generation = counters[0]
+        deadline = monotonic() + timeout
+        while generation % 2:
+            # уступить процессор писателю
+            sleep(0)
+            current = counters[0]
+            if current != generation:
+                generation, deadline = current, monotonic() + timeout
+            elif monotonic() > deadline:
+                raise TimeoutError(f'Writer of {self.name} stopped inside a write.')
+        return generation
+
+    def snapshot(self, timeout: float = 1.0) -> array:
+        """Согласованная копия матрицы (повтор, если попали на запись)."""
+        while True:
+            generation = self.__stable(timeout)
+            copy = array('d')
+            copy.frombytes(self.__raw)
+            if self.__counters[0] == generation:
+                return copy
+
+    def view(self, timeout: float = 1.0) -> tuple[int, memoryview]:
+        """Матрица без копирования и поколение на момент начала чтения.
+
+        После чтения данные согласованы, если valid(поколение).
+        """
+        return self.__stable(timeout), self.values
+
+    def valid(self, generation: int) -> bool:
+        return self.__counters[0] == generation
+
+    def row(self, values: memoryview | array, index: int) -> memoryview | array:
+        """Строка питомца index в матрице или снимке."""
+        return values[index * self.width:(index + 1) * self.width]
+
+    def close(self) -> None:
+        for view in (self.__counters, self.__header, self.values, self.__raw):
+            view.release()
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+    def __enter__(self) -> 'SharedMatrix':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,78 @@
+"""
+Пакетное выполнение действий (apply_actions) против поочерёдного.
+
+Запуск из каталога src:
+    python -m pytest -q tests
+"""
+import contextlib
+import io
+import random
+
+from model.actions import apply_action, apply_actions
+from model.collection import cube
+from model.events import EventLog
+from model.kind import Creature
+from model.parameters import Satiety
+
+
+def _pets(count: int, seed: int) -> list[Creature]:
+    rand = random.Random(seed)
+    pets = []
+    for i in range(count):
+        pet = Creature(cube, str(i))
+        # в том числе значения вне диапазона
+        pet.storage.data[Satiety.index] = rand.uniform(-20.0, 120.0)
+        pets.append(pet)
+    return pets
+
+
+def _batch(pets: list[Creature], count: int, seed: int) -> list[tuple[int, str, float | None]]:
+    rand = random.Random(seed)
+    names = sorted(action.name for action in pets[0].player_actions)
+    return [
+        (
+            rand.randrange(len(pets)),
+            rand.choice(names),
+            rand.choice((None, rand.uniform(-15.0, 15.0))),
+        )
+        for _ in range(count)
+    ]
+
+
+def _bound(pet: Creature, name: str):
+    return next(action for action in pet.player_actions if action.name == name)
+
+
+def test_batch_matches_sequential():
+    for seed in range(20):
+        sequential, batched = _pets(8, seed), _pets(8, seed)
+        batch = _batch(sequential, 200, seed)
+        with contextlib.redirect_stdout(io.StringIO()):
+            for row, name, amount in batch:
+                pet = sequential[row]
+                apply_action(pet, _bound(pet, name).prototype, amount)
+            apply_actions(
+                (batched[row], _bound(batched[row], name).prototype, amount)
+                for row, name, amount in batch
+            )
+        for one, other in zip(sequential, batched):
+            assert list(one.storage.data) == list(other.storage.data)
+
+
+def test_bound_actions_are_accepted():
+    sequential, batched = _pets(3, 1), _pets(3, 1)
+    batch = _batch(sequential, 50, 1)
+    for pet in sequential + batched:
+        EventLog.attach(pet)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for row, name, amount in batch:
+            pet = sequential[row]
+            apply_action(pet, _bound(pet, name), amount)
+        apply_actions(
+            (batched[row], _bound(batched[row], name), amount)
+            for row, name, amount in batch
+        )
+        for one, other in zip(sequential, batched):
+            assert list(one.storage.data) == list(other.storage.data)
+            for pet in (one, other):
+                assert list(pet.journal.rebuild().storage.data) == list(pet.storage.data)
@@ -0,0 +1,65 @@
+"""
+Пересчёт за много тактов одним шагом (Creature.advance, fast_forward)
+против пошагового обновления.
+
+Запуск из каталога src:
+    python -m pytest -q tests
+"""
+import random
+
+import model.kind
+from model.kind import Creature, Kind, MaturePhase
+from model.parameters import Fatigue, Health, Hygiene, Mood, Satiety, Stamina
+
+
+def _kind(rand: random.Random) -> Kind:
+    """Случайный вид; начальные значения - в том числе вне диапазонов."""
+    phases = []
+    for _ in range(rand.randint(1, 4)):
+        low = rand.choice((0, 0, 0, -3, 2, 5))
+        high = low + rand.randint(5, 40)
+        parameters = [
+            cls(
+                rand.choice((0, rand.uniform(low - 3, high + 3), rand.randint(low, high))),
+                low, high
+            )
+            for cls in (Health, Satiety, Fatigue, Hygiene, Mood, Stamina)
+        ]
+        phases.append(MaturePhase(
+            rand.randint(1, 5), *parameters, player_actions=[], creature_actions=[]
+        ))
+    return Kind('k', *phases)
+
+
+def _values(creature: Creature) -> list[float]:
+    return [parameter.value for parameter in creature.parameters.values()]
+
+
+def test_advance_matches_ticks():
+    for seed in range(1500):
+        rand = random.Random(seed)
+        kind = _kind(rand)
+        age = rand.randint(0, max(kind)[1])
+        fast, slow = Creature(kind, 'a', age), Creature(kind, 'b', age)
+        ticks = rand.randint(0, 500)
+        fast.advance(ticks)
+        for _ in range(ticks):
+            slow._tick()
+        assert _values(fast) == _values(slow), seed
+
+
+def test_fast_forward_matches_days(monkeypatch):
+    for seed in range(1500):
+        rand = random.Random(seed)
+        kind = _kind(rand)
+        ticks_per_day = rand.randint(1, 30)
+        monkeypatch.setattr(model.kind, 'TICKS_PER_DAY', ticks_per_day)
+        fast, slow = Creature(kind, 'a'), Creature(kind, 'b')
+        days = rand.randint(0, max(kind)[1])
+        fast.fast_forward(days)
+        for _ in range(days):
+            for _ in range(ticks_per_day):
+                slow._tick()
+            slow.age += 1
+        assert fast.age == slow.age
+        assert _values(fast) == _values(slow), seed
@@ -0,0 +1,125 @@
+"""
+Переходы между возрастными периодами: планы переходов Kind (PhaseTransition)
+против пошагового изменения возраста.
+
+Запуск из каталога src:
+    python -m pytest -q tests
+"""
+import random
+
+from model.actions import ChaseTail, Feed, TeaseHead
+from model.collection import cube
+from model.kind import Creature, Kind, MaturePhase
+from model.parameters import Fatigue, Health, Hygiene, Mood, Satiety, Stamina, Parameters
+from model.population import Population
+
+
+def _kind(rand: random.Random) -> Kind:
+    """Случайный вид: разные наборы параметров, диапазоны и действия периодов."""
+    phases = []
+    for _ in range(rand.randint(1, 6)):
+        parameters = [
+            cls(rand.choice((0, 0, 5, 30)), 0, rand.choice((20, 50, 100)))
+            for cls in (Health, Satiety, Fatigue, Hygiene, Mood, Stamina)
+            if cls in (Health, Satiety) or rand.random() < 0.5
+        ]
+        phases.append(MaturePhase(
+            rand.randint(1, 10),
+            *parameters,
+            player_actions=[Feed(rand.randint(1, 9)), TeaseHead()],
+            creature_actions=[ChaseTail(rand.random())]
+        ))
+    return Kind('k', *phases)
+
+
+def _state(creature: Creature) -> tuple:
+    return (
+        creature.age,
+        list(creature.storage.data),
+        list(creature.storage.ranges.ranges),
+        set(creature.parameters),
+        {action.prototype for action in creature.player_actions},
+        {action.prototype for action in creature.creature_actions},
+        creature.scheduler,
+        [type(parameter) for parameter in creature.plan.order],
+    )
+
+
+def _reference_grow(creature: Creature, age: int) -> None:
+    """Смена возраста без плана перехода: параметры нового периода напрямую."""
+    phase = creature.kind[age]
+    for param in phase.parameters:
+        cls = Parameters[param.name].value
+        if cls in creature.parameters:
+            value = param.value or creature.parameters[cls].value
+            creature.storage.put(cls.index, value, param._min, param._max)
+    creature._Creature__age = age
+
+
+def test_transitions_match_direct_phase_change():
+    rand = random.Random(5)
+    for _ in range(200):
+        pet, reference = Creature(cube, 'a'), Creature(cube, 'b')
+        age = 0
+        for _ in range(rand.randint(1, 6)):
+            days = rand.randint(1, 30)
+            for _ in range(rand.randint(0, 300)):
+                pet.update()
+                reference.update()
+            if age + days > max(cube)[1]:
+                break
+            pet.age = age + days
+            if cube[age] is not cube[age + days]:
+                _reference_grow(reference, age + days)
+            else:
+                reference._Creature__age = age + days
+            age += days
+        assert list(pet.storage.data) == list(reference.storage.data)
+        assert {a.prototype for a in pet.player_actions} == set(cube[pet.age].player_actions)
+        assert pet.scheduler is cube[pet.age].scheduler
+
+
+def test_population_grow_matches_creatures():
+    rand = random.Random(1)
+    for _ in range(20):
+        kind = _kind(rand)
+        last = max(kind)[1]
+        population = Population(kind, 12)
+        pets = [Creature(kind, str(i)) for i in range(12)]
+        while True:
+            days = rand.randint(1, 3)
+            if max(population.ages) + days > last:
+                break
+            for _ in range(rand.randint(0, 40)):
+                population.tick()
+                for pet in pets:
+                    pet._tick()
+            population.grow(days)
+            for pet in pets:
+                pet.age += days
+            assert list(population.data) == [x for pet in pets for x in pet.storage.data]
+            assert population.ranges == [pet.storage.ranges for pet in pets]
+
+
+def test_age_jump_matches_daily_steps():
+    rand = random.Random(7)
+    for _ in range(300):
+        kind = _kind(rand)
+        last = max(kind)[1]
+        jumped, stepped = Creature(kind, 'a'), Creature(kind, 'b')
+        for _ in range(rand.randint(1, 8)):
+            for _ in range(rand.randint(0, 50)):
+                jumped.update()
+                stepped.update()
+            target = rand.randint(0, last)
+            days = target - jumped.age
+            if days >= 0 and rand.random() < 0.5:
+                crossed = jumped.grow(days)
+                assert crossed == kind.position(target) - kind.position(target - days)
+            else:
+                # в том числе назад
+                jumped.age = target
+            step = 1 if days >= 0 else -1
+            while stepped.age != target:
+                stepped.age += step
+            assert _state(jumped) == _state(stepped)
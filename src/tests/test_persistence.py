@@ -0,0 +1,62 @@
+"""
+Сохранение и загрузка питомца, файл истории.
+
+Запуск из каталога src:
+    python -m pytest -q tests
+"""
+import gc
+
+from model.collection import cube
+from model.kind import Creature
+from model.parameters import Satiety
+from model.persistence import dump, load, open_history
+
+
+def _kinds() -> dict:
+    return {cube.name: cube}
+
+
+def test_round_trip_with_appended_history(tmp_path):
+    path = tmp_path / 'pet.tmg'
+    pet = Creature(cube, 'pet')
+    for _ in range(100):
+        pet.update()
+    dump(pet, path)
+    loaded = load(path, _kinds())
+    assert list(loaded.storage.data) == list(pet.storage.data)
+    assert loaded.history.total == pet.history.total
+    for _ in range(50):
+        loaded.update()
+    dump(loaded, path)
+    with open_history(path) as history:
+        assert len(history) == 150
+        assert list(history.ticks) == list(range(150))
+        assert history[-1] == loaded.history[-1]
+        assert history[99] == pet.history[99]
+
+
+def test_close_with_live_columns(tmp_path):
+    path = tmp_path / 'pet.tmg'
+    pet = Creature(cube, 'pet')
+    for _ in range(10):
+        pet.update()
+    dump(pet, path)
+    with open_history(path) as history:
+        column = history.get_param(Satiety)
+        ages = history.ages
+    assert list(column) == list(pet.history.get_param(Satiety))
+    assert len(ages) == 10
+    del column, ages
+    gc.collect()
+
+
+def test_torn_tail_is_ignored(tmp_path):
+    path = tmp_path / 'pet.tmg'
+    pet = Creature(cube, 'pet')
+    for _ in range(10):
+        pet.update()
+    dump(pet, path)
+    with open(path.with_name(path.name + '.hist'), 'ab') as file:
+        file.write(b'abc')
+    with open_history(path) as history:
+        assert len(history) == 10